@@ -1,13 +1,23 @@
-import os
+import sqlite3
 
 import pytest
 
+from src.ein import _json
 from src.ein.database import Database
 from src.ein.graph import Graph
+from src.ein.node import Node
 
-TEST_DB = "test.db"
+# in-memory db shared by every connection in the process,
+# it's dropped once the last connection closes
+TEST_DB = "file:ein_test?mode=memory&cache=shared"
 TEST_SCHEMA = "test"
 
+# rows added by `db_populated`
+POPULATED_NODES = [
+    {"id": "select-test", "body": "selected-body"},
+    {"id": "select-test-2", "body": "selected-body"},
+]
+
 
 @pytest.fixture()
 def db_setup():
@@ -17,13 +27,45 @@ def db_setup():
     because that's difficult to check values in, so
     we return `Tuple` objects instead for hard comparisons.
     """
-    return Database(db_path=TEST_DB, row_factory=False)
+    db = Database(db_path=TEST_DB, row_factory=False, uri=True)
+    yield db
+    db.close()
 
 
 @pytest.fixture()
-def graph_setup(db_setup):
-    """A `Graph` instance with no row factory."""
-    return Graph(db_path=TEST_DB)
+def db_populated(db_setup):
+    """`db_setup` with a schema, two nodes and an edge between them.
+
+    Shared by the read tests, which only differ in
+    the method they call.
+    """
+    db_setup.add_schema(TEST_SCHEMA)
+    db_setup.add_nodes(
+        TEST_SCHEMA,
+        [(node["id"], _json.dumps(node)) for node in POPULATED_NODES],
+    )
+    db_setup.add_edge(TEST_SCHEMA, POPULATED_NODES[0]["id"], POPULATED_NODES[1]["id"])
+    yield db_setup
+
+
+@pytest.fixture()
+def graph_setup():
+    """A `Graph` instance on the workspace DB.
+
+    `Graph` always reads `sqlite3.Row` objects, pair it
+    with `db_setup` or `db_setup_row_factory` to check rows.
+    """
+    graph = Graph(db_path=TEST_DB, uri=True)
+    yield graph
+    graph.database.close()
+
+
+@pytest.fixture()
+def make_node():
+    """Builds test `Node` objects with the shared body."""
+    def _make_node(node_id, schema_name=TEST_SCHEMA):
+        return Node(schema_name=schema_name, id=node_id, body={"test": "value"})
+    return _make_node
 
 
 @pytest.fixture()
@@ -33,19 +75,18 @@ def db_setup_row_factory():
     We want to return `sqlite3.Row` objects for
     `Graph`, `Node`, and `Edge` tests.
     """
-    return Database(db_path=TEST_DB, row_factory=True)
-
-
-@pytest.fixture()
-def graph_setup_row_factory(db_setup_row_factory):
-    """A `Graph` instance with a row factory."""
-    return Graph(db_path=TEST_DB)
+    db = Database(db_path=TEST_DB, row_factory=True, uri=True)
+    yield db
+    db.close()
 
 
 @pytest.fixture(autouse=True)
 def cleanup_run():
-    """Removes workspaces on teardown."""
-    yield
-    if os.path.exists(TEST_DB):
-        os.remove(TEST_DB)
+    """Holds the in-memory workspace open for one test.
 
+    No files are written, the db is dropped when this
+    (and every other) connection closes on teardown.
+    """
+    connection = sqlite3.connect(TEST_DB, uri=True)
+    yield
+    connection.close()
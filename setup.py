@@ -24,4 +24,5 @@ setuptools.setup(
     packages=setuptools.find_packages(where="src"),
     package_data={"ein": ["sql/*.sql"],},
     python_requires=">=3.6",
+    extras_require={"orjson": ["orjson"]},
 )
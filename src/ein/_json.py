@@ -0,0 +1,54 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# SQLite's `json()` stores documents without whitespace,
+# dumping to the same form skips a pass in SQLite and lets
+# dumps be compared with stored bodies directly
+SEPARATORS = (",", ":")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to compact JSON text.
+
+    Uses `orjson` when it's installed. Both paths give the
+    same text: no whitespace, and non-ASCII characters escaped
+    (e.g., `\\u00e9`) like bodies written by earlier versions,
+    so body searches match the stored text.
+
+    Params:
+        obj (Any): Object to serialize.
+
+    Returns:
+        json_text (str): JSON without whitespace.
+    """
+    if orjson is not None:
+        try:
+            json_text = orjson.dumps(obj).decode()
+        except TypeError:
+            # e.g., non-`str` dict keys or integers past 64 bits,
+            # which `json` accepts
+            pass
+        else:
+            # `orjson` can't escape non-ASCII characters
+            if json_text.isascii():
+                return json_text
+    return json.dumps(obj, separators=SEPARATORS)
+
+
+def loads(json_text: Union[str, bytes]) -> Any:
+    """Deserialize JSON text.
+
+    Params:
+        json_text (str|bytes): JSON text to load.
+
+    Returns:
+        obj (Any): Deserialized object.
+    """
+    if orjson is not None:
+        return orjson.loads(json_text)
+    return json.loads(json_text)
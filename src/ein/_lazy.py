@@ -0,0 +1,132 @@
+import abc
+import collections
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Any, Hashable, Iterator, Optional, Tuple
+
+from .edge import Edge
+from .node import Node
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .graph import Graph
+
+# nodes/edges kept in memory by each lazy view
+CACHE_SIZE = 4096
+
+
+class _LazyView(MutableMapping, abc.ABC):
+    """Dict-like view that loads rows from the db on access.
+
+    Loaded objects are kept in a LRU cache of `cache_size`
+    entries. Setting a key only changes the cache, the `Graph`
+    writes to the db itself. Deleting a key deletes the object
+    from the db through the `Graph`, so it's gone from the view
+    whether or not it was cached.
+    """
+
+    def __init__(self, graph: "Graph", cache_size: int = CACHE_SIZE) -> None:
+        """Lazy view over a graph's db.
+
+        Params:
+            graph (Graph): Graph with the `database` and `schemas`.
+            cache_size (int): Objects kept in memory.
+
+        Returns:
+            None
+        """
+        self._graph = graph
+        self._cache_size = cache_size
+        self._cache: "collections.OrderedDict[Hashable, Any]" = collections.OrderedDict()
+
+    @abc.abstractmethod
+    def _load(self, key: Hashable) -> Optional[Any]:
+        """Load one object from the db, `None` if it doesn't exist."""
+
+    @abc.abstractmethod
+    def _delete(self, value: Any) -> None:
+        """Delete one object from the db and the view."""
+
+    def __getitem__(self, key: Hashable) -> Any:
+        try:
+            value = self._cache[key]
+        except KeyError:
+            value = self._load(key)
+            if value is None:
+                raise KeyError(key)
+            self[key] = value
+        else:
+            self._cache.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def __delitem__(self, key: Hashable) -> None:
+        # raises `KeyError` if neither cached nor in the db
+        self._delete(self[key])
+
+    def evict(self, key: Hashable) -> None:
+        """Drop one cached object, e.g., after it's deleted."""
+        self._cache.pop(key, None)
+
+    def invalidate(self) -> None:
+        """Drop every cached object, e.g., after a schema changes."""
+        self._cache.clear()
+
+
+class NodeView(_LazyView):
+    """`Graph.nodes` keyed by node ID, loaded on access."""
+
+    def _load(self, node_id: Hashable) -> Optional[Node]:
+        for schema_name in self._graph.schemas:
+            node_row = self._graph.database.get_node(schema_name=schema_name, node_id=node_id)
+            if node_row:
+                return self._graph._create_node(schema_name=schema_name, node_row=node_row)
+        return None
+
+    def _delete(self, node: Node) -> None:
+        self._graph.delete_node(node)
+
+    def __iter__(self) -> Iterator[str]:
+        for schema_name in list(self._graph.schemas):
+            for node_row in self._graph.database.iter_all_nodes(schema_name, tuples=True):
+                yield node_row[0]
+
+    def __len__(self) -> int:
+        return sum(
+            self._graph.database.count_nodes(schema_name)
+            for schema_name in self._graph.schemas
+        )
+
+
+class EdgeView(_LazyView):
+    """`Graph.edges` keyed by `(source_id, target_id)`, loaded on access."""
+
+    def _load(self, edge_key: Hashable) -> Optional[Edge]:
+        source_id, target_id = edge_key
+        for schema_name in self._graph.schemas:
+            edge_row = self._graph.database.get_edge(
+                schema_name=schema_name,
+                source_id=source_id,
+                target_id=target_id,
+            )
+            if edge_row:
+                return self._graph._create_edge(schema_name=schema_name, edge_row=edge_row)
+        return None
+
+    def _delete(self, edge: Edge) -> None:
+        self._graph.delete_edge(edge)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for schema_name in list(self._graph.schemas):
+            for edge_row in self._graph.database.iter_all_edges(schema_name, tuples=True):
+                # source, source_schema, target, ...
+                yield (edge_row[0], edge_row[2])
+
+    def __len__(self) -> int:
+        return sum(
+            self._graph.database.count_edges(schema_name)
+            for schema_name in self._graph.schemas
+        )
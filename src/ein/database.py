@@ -1,10 +1,210 @@
-import json
+import collections
+import contextlib
+import functools
+import itertools
 import os
 import pathlib
+import re
 import sqlite3
-from typing import Dict, List, Optional, Tuple, Union
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, Union)
 
-ALLOWED_OPERATORS = {"and", "not", "or"}
+from . import _json
+
+ALLOWED_OPERATORS = frozenset({"and", "not", "or"})
+
+# SQL placed between the `get_nodes` clauses for each operator,
+# "not" keeps rows matching the id but not the body
+OPERATOR_SQL = {"and": " AND ", "not": " AND NOT ", "or": " OR "}
+
+# comparisons allowed in `get_nodes` predicates
+PREDICATE_OPERATORS = frozenset({"=", "!=", "<", "<=", ">", ">=", "is", "is not", "like"})
+
+# size of the per-connection prepared statement cache, each schema
+# has ~20 statements plus the `IN (...)`/`{{params}}` variants
+CACHED_STATEMENTS = 512
+
+# split schema scripts kept in memory, each schema has its own
+# create/update/delete scripts and they only run on schema changes
+CACHED_SCRIPTS = 32
+
+# SQLite's default `SQLITE_MAX_VARIABLE_NUMBER` before 3.32,
+# the host parameter limit for a single statement
+MAX_VARIABLE_NUMBER = 999
+
+# rows pulled from SQLite at a time when streaming results
+FETCH_CHUNK_SIZE = 1024
+
+# rows taken from an iterable at a time when streaming inserts
+INSERT_CHUNK_SIZE = 1000
+
+# cached query results when the cache is enabled
+QUERY_CACHE_SIZE = 4096
+
+# one row of host parameters for the multi-row inserts
+NODE_VALUES_SQL = "(?, json(?))"
+EDGE_VALUES_SQL = "(?, ?, ?, ?, json(?))"
+
+# every SQL utility file, read once at import
+_SQL_TEMPLATES = {
+    path.name: path.read_text()
+    for path in (pathlib.Path(os.path.dirname(__file__)) / "sql").glob("*.sql")
+}
+
+
+def _render_schema_sql(schema_name: str) -> Dict[str, str]:
+    """Render every `.sql` utility file for a schema.
+
+    Params:
+        schema_name (str): Name of the schema to use.
+
+    Returns:
+        sql_texts (Dict[str, str]): SQL text with the schema added,
+            keyed by file name.
+    """
+    return {
+        file_name: sql_text.replace("{{schema_name}}", schema_name)
+        for file_name, sql_text in _SQL_TEMPLATES.items()
+    }
+
+
+@functools.lru_cache(maxsize=CACHED_STATEMENTS)
+def _render_values_sql(sql_text: str, values_sql: str, row_count: int) -> str:
+    """Render a statement with repeated host parameters once.
+
+    Used for multi-row `INSERT`s and `IN (...)` lists. Every
+    schema and row count is its own string, so only as many
+    are kept as the connection's statement cache holds.
+
+    Params:
+        sql_text (str): SQL text with a `{{values}}` placeholder.
+        values_sql (str): Host parameters for a single row/value.
+        row_count (int): Number of rows/values in the statement.
+
+    Returns:
+        sql_text (str): SQL text with the values added.
+    """
+    return sql_text.replace("{{values}}", ", ".join([values_sql] * row_count))
+
+
+@functools.lru_cache(maxsize=CACHED_STATEMENTS)
+def _render_params_sql(sql_text: str, params_sql: str) -> str:
+    """Render a `SELECT` with a `{{params}}` clause.
+
+    Filter keys and JSON paths are written into the clause, so
+    callers can produce any number of distinct strings. Only as
+    many are kept as the connection's statement cache holds.
+
+    Params:
+        sql_text (str): SQL text with a `{{params}}` placeholder.
+        params_sql (str): `WHERE` clause to add.
+
+    Returns:
+        sql_text (str): SQL text with the clause added.
+    """
+    return sql_text.replace("{{params}}", params_sql)
+
+
+@functools.lru_cache(maxsize=CACHED_SCRIPTS)
+def _split_sql_script(sql_text: str) -> Tuple[str, ...]:
+    """Split a SQL script into single statements once.
+
+    Splits on `;` and joins the pieces back together until
+    SQLite sees a complete statement, so semicolons in trigger
+    bodies and string literals are kept. Scripts are rendered
+    per schema, only the last `CACHED_SCRIPTS` are kept.
+
+    Params:
+        sql_text (str): SQL script.
+
+    Returns:
+        statements (Tuple[str, ...]): Each statement of the script.
+    """
+    statements = []
+    statement = ""
+    for part in sql_text.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip() != ";":
+                statements.append(statement.strip())
+            statement = ""
+    return tuple(statements)
+
+
+def _escape_like(text: str) -> str:
+    """Escape `LIKE` wildcards using a backslash.
+
+    Params:
+        text (str): Text to match literally.
+
+    Returns:
+        escaped_text (str): Text safe to use with `ESCAPE '\\'`.
+    """
+    return (
+        text.replace("\\", "\\\\")
+            .replace("%", "\\%")
+            .replace("_", "\\_")
+    )
+
+
+def _body_key_sql(key: str) -> str:
+    """SQL expression for a top-level key of a node body.
+
+    The key is part of the SQL text rather than a bound
+    parameter, SQLite only uses an expression index when
+    the query has the exact same expression.
+
+    Params:
+        key (str): Top-level key of the body.
+
+    Returns:
+        key_sql (str): `json_extract` expression for the key.
+
+    Raises:
+        ValueError: The key contains a double quote, which
+            can't be used in a JSON path.
+    """
+    if '"' in key:
+        raise ValueError(f"Body keys can't contain double quotes: {key}")
+    return _json_path_sql('$."' + key + '"')
+
+
+def _json_path_sql(json_path: str) -> str:
+    """SQL expression for a JSON path of a node body.
+
+    Simple top-level paths (`$.key`) are written the same way
+    as `_body_key_sql`, so they use `add_node_index` indexes.
+
+    Params:
+        json_path (str): JSON path, e.g., "$.owner.name".
+
+    Returns:
+        path_sql (str): `json_extract` expression for the path.
+    """
+    top_level_key = re.fullmatch(r"\$\.(\w+)", json_path)
+    if top_level_key:
+        json_path = '$."' + top_level_key.group(1) + '"'
+    return "json_extract(body, '" + json_path.replace("'", "''") + "')"
+
+
+def _fts_phrase(text: str) -> Optional[str]:
+    """Build an FTS5 query for text found anywhere in a body.
+
+    The quoted string is split by the same tokenizer as the
+    indexed bodies, so it becomes a phrase of those tokens.
+    The last token may be cut short in the body (e.g., `1`
+    inside `12`), so it is matched as a prefix.
+
+    Params:
+        text (str): Text to search for.
+
+    Returns:
+        query (str | None): FTS5 query, `None` if the text
+            has no tokens to search with.
+    """
+    if not any(char.isalnum() for char in text):
+        return None
+    return '"' + text.replace('"', '""') + '"*'
 
 
 class IncompleteStatementError(Exception):
@@ -20,7 +220,31 @@ class DisallowedOperatorError(Exception):
 class Database:
     """Database interface to SQLite DB."""
 
-    def __init__(self, db_path: str, row_factory: bool = True) -> None:
+    # attribute lookups on every query skip the instance `__dict__`
+    __slots__ = (
+        "db_path",
+        "_connection",
+        "_cursor",
+        "_reader_cursors",
+        "_next_reader_cursor",
+        "_closed",
+        "_sql_by_schema",
+        "_fts_by_schema",
+        "_query_cache_size",
+        "_query_cache",
+        "_schema_versions",
+    )
+
+    def __init__(self,
+                 db_path: str,
+                 row_factory: bool = True,
+                 journal_mode: str = "WAL",
+                 synchronous: str = "NORMAL",
+                 cache_size: int = -64000,
+                 mmap_size: int = 268435456,
+                 uri: bool = False,
+                 readers: int = 0,
+                 query_cache_size: int = 0) -> None:
         """Establish connection to new or existing db.
 
         Params:
@@ -29,20 +253,112 @@ class Database:
             row_factory (bool): Uses the `sqlite3.Row` object to return
                 from queries. This gives dictionary-like key access to
                 column names. Defaults to `True`.
+            journal_mode (str): SQLite `journal_mode` pragma for the
+                connection. Defaults to "WAL".
+            synchronous (str): SQLite `synchronous` pragma for the
+                connection. Defaults to "NORMAL", which doesn't fsync
+                on every commit when used with WAL.
+            cache_size (int): SQLite `cache_size` pragma, negative
+                values are KiB. Defaults to -64000 (~64MB).
+            mmap_size (int): SQLite `mmap_size` pragma in bytes, pages
+                are read through memory-mapped I/O instead of `read()`.
+                Defaults to 268435456 (256MB), `0` disables it.
+            uri (bool): Treat `db_path` as a SQLite URI, e.g.,
+                "file:name?mode=memory&cache=shared" for an
+                in-memory db shared between connections.
+                Defaults to `False`.
+            readers (int): Number of extra read-only connections
+                (`PRAGMA query_only`) that `get_*` calls rotate over,
+                so reads don't queue behind the write connection.
+                Only useful with WAL and a db file, a plain ":memory:"
+                db is private to each connection. Defaults to `0`,
+                all queries use the write connection.
+            query_cache_size (int): Results of `get_node`, `get_nodes`,
+                `get_edge` and `get_edges` kept in memory, e.g.,
+                `QUERY_CACHE_SIZE`. Writes through this `Database` invalidate
+                the results of their schema, writes from other connections
+                aren't seen until then. Defaults to `0`, no caching.
 
         Returns:
             None
         """
         self.db_path = db_path
-        self._connection = sqlite3.connect(db_path)
+
+        # WAL with `synchronous=NORMAL` skips the fsync on
+        # each commit, see "pragmas.sql" for the rest
+        pragmas_sql = self._read_sql_file("pragmas.sql")
+        pragmas_sql = pragmas_sql.replace("{{journal_mode}}", journal_mode)
+        pragmas_sql = pragmas_sql.replace("{{synchronous}}", synchronous)
+        pragmas_sql = pragmas_sql.replace("{{cache_size}}", str(int(cache_size)))
+        pragmas_sql = pragmas_sql.replace("{{mmap_size}}", str(int(mmap_size)))
+
+        self._connection = self._connect(pragmas_sql, row_factory, uri)
+        self._cursor = self._connection.cursor()
+
+        self._reader_cursors = [
+            self._connect(pragmas_sql + "PRAGMA query_only = ON;\n", row_factory, uri).cursor()
+            for _ in range(readers)
+        ]
+        self._next_reader_cursor = itertools.cycle(self._reader_cursors)
+        self._closed = False
+
+        # rendered SQL for each schema, keyed by file name
+        self._sql_by_schema: Dict[str, Dict[str, str]] = {}
+
+        # whether each schema has a full-text index of node bodies
+        self._fts_by_schema: Dict[str, bool] = {}
+
+        # LRU of query results, keys include the schema's version
+        # so a write to a schema makes its old results unreachable
+        self._query_cache_size = query_cache_size
+        self._query_cache: "collections.OrderedDict[Tuple, Any]" = collections.OrderedDict()
+        self._schema_versions: Dict[str, int] = collections.defaultdict(int)
+
+    def _connect(self,
+                 pragmas_sql: str,
+                 row_factory: bool,
+                 uri: bool) -> sqlite3.Connection:
+        """Open a connection to the db.
+
+        Params:
+            pragmas_sql (str): Pragmas to run on the connection.
+            row_factory (bool): Use `sqlite3.Row` for results.
+            uri (bool): Treat `db_path` as a SQLite URI.
+
+        Returns:
+            connection (sqlite3.Connection): A new connection.
+        """
+        # `isolation_level=None` leaves the driver in autocommit mode,
+        # each write commits on its own unless it's in a `transaction()`
+        connection = sqlite3.connect(
+            self.db_path,
+            cached_statements=CACHED_STATEMENTS,
+            isolation_level=None,
+            uri=uri,
+        )
+        connection.executescript(pragmas_sql)
 
         # Returns items as a sqlite3.Row
         # this allows reference to columns with
         # a dictionary key
         if row_factory:
-            self._connection.row_factory = sqlite3.Row
+            connection.row_factory = sqlite3.Row
 
-        self._cursor = self._connection.cursor()
+        return connection
+
+    def _read_cursor(self) -> sqlite3.Cursor:
+        """Cursor to run a query on.
+
+        Rotates over the reader connections, if any. Inside
+        a `transaction()` the write connection is used so
+        uncommitted writes are visible.
+
+        Returns:
+            cursor (sqlite3.Cursor): Cursor for a read query.
+        """
+        if not self._reader_cursors or self._connection.in_transaction:
+            return self._cursor
+        return next(self._next_reader_cursor)
 
     def _read_sql_file(self,
                        file_name: str,
@@ -51,7 +367,9 @@ class Database:
 
         Reads project SQL utility files and inserts the
         `schema_name` variable to create a pseudo-schema
-        object.
+        object. Every file is rendered once per schema (on
+        `add_schema` or first use), so the same SQL string
+        is handed to SQLite's statement cache.
 
         Params:
             file_name (str): Name of the file to read.
@@ -60,13 +378,164 @@ class Database:
         Returns:
             sql_text (str): SQL text with the schema added.
         """
-        with open(pathlib.Path(os.path.dirname(__file__)) / "sql" / file_name) as file:
-            sql_text = file.read()
+        if not schema_name:
+            return _SQL_TEMPLATES[file_name]
 
-        if schema_name:
-            sql_text = sql_text.replace("{{schema_name}}", schema_name)
+        try:
+            return self._sql_by_schema[schema_name][file_name]
+        except KeyError:
+            # schemas that exist in the db but weren't
+            # added by this instance
+            self._sql_by_schema[schema_name] = _render_schema_sql(schema_name)
+            return self._sql_by_schema[schema_name][file_name]
 
-        return sql_text
+    def _has_fts(self, schema_name: str) -> bool:
+        """Check for the full-text index of a schema's nodes.
+
+        Schemas created before the index was added don't have
+        one until `add_schema` is called for them again.
+
+        Params:
+            schema_name (str): Name of the schema to check.
+
+        Returns:
+            has_fts (bool): The `<schema_name>_nodes_fts` table exists.
+        """
+        if schema_name not in self._fts_by_schema:
+            sql_text = self._read_sql_file("select-table.sql")
+            fts_table = self._read_cursor().execute(
+                sql_text, (f"{schema_name}_nodes_fts",)
+            ).fetchone()
+            self._fts_by_schema[schema_name] = fts_table is not None
+        return self._fts_by_schema[schema_name]
+
+    def _cached_query(self,
+                      schema_name: str,
+                      query_key: Tuple,
+                      query: Callable[[], Any]) -> Any:
+        """Run a query through the query cache.
+
+        Params:
+            schema_name (str): Schema the query reads.
+            query_key (Tuple): Method name and arguments
+                that identify the result.
+            query (Callable): Runs the query if it isn't cached.
+
+        Returns:
+            result (Any): Result of `query`.
+        """
+        if not self._query_cache_size:
+            return query()
+
+        key = (schema_name, self._schema_versions[schema_name]) + query_key
+        try:
+            result = self._query_cache[key]
+        except KeyError:
+            result = query()
+            self._query_cache[key] = result
+            if len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+        else:
+            self._query_cache.move_to_end(key)
+        return result
+
+    def _invalidate(self, schema_name: Optional[str] = None) -> None:
+        """Invalidate cached query results.
+
+        Params:
+            schema_name (str|None): Schema that was written to,
+                `None` invalidates every schema.
+
+        Returns:
+            None
+        """
+        if not self._query_cache_size:
+            return
+
+        if schema_name is None:
+            self._query_cache.clear()
+        else:
+            self._schema_versions[schema_name] += 1
+
+    def close(self) -> None:
+        """Close the connection to the db.
+
+        Runs `PRAGMA optimize` first so SQLite can refresh the
+        planner stats of tables that need it. The cursor is
+        closed before the connection, a cursor left holding a
+        statement keeps the connection open until it is
+        garbage collected. Closing twice does nothing.
+        """
+        if self._closed:
+            return
+
+        try:
+            self._cursor.execute("PRAGMA optimize;")
+        except sqlite3.OperationalError:
+            # e.g., a read-only or busy db, stats are only a hint
+            pass
+
+        self._cursor.close()
+        self._connection.close()
+        for cursor in self._reader_cursors:
+            cursor.close()
+            cursor.connection.close()
+        self._closed = True
+
+    def __del__(self) -> None:
+        # `__init__` may have failed before connecting
+        if not getattr(self, "_closed", True):
+            self.close()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group many writes into one transaction.
+
+        Writes inside the block are committed once on exit
+        instead of once per call, or rolled back if an exception
+        is raised. The transaction is started with `BEGIN IMMEDIATE`
+        so the write lock is taken up front. Nested blocks join
+        the outer transaction.
+
+        Example:
+            with db.transaction():
+                for node_id, node_body in nodes:
+                    db.add_node(schema_name, node_id, node_body)
+
+        Yields:
+            None
+        """
+        if self._connection.in_transaction:
+            yield
+            return
+
+        self._cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.rollback()
+            # results read inside the transaction were rolled back too
+            self._invalidate()
+            raise
+        else:
+            self._connection.commit()
+
+    def _execute_script(self, sql_text: str) -> None:
+        """Execute a SQL script in one transaction.
+
+        Unlike `executescript` this doesn't commit an open
+        `transaction()`, and each statement goes through
+        the statement cache.
+
+        Params:
+            sql_text (str): SQL script to execute.
+
+        Returns:
+            None
+        """
+        with self.transaction():
+            for statement in _split_sql_script(sql_text):
+                self._cursor.execute(statement)
 
     def add_schema(self, schema_name: str) -> None:
         """Adds a 'schema' to SQLite db.
@@ -81,9 +550,29 @@ class Database:
         Returns:
             None
         """
+        self._sql_by_schema[schema_name] = _render_schema_sql(schema_name)
         sql_text = self._read_sql_file("create-schema.sql", schema_name)
-        self._cursor.executescript(sql_text)
-        self._connection.commit()
+        self._execute_script(sql_text)
+        self._fts_by_schema[schema_name] = True
+        self._invalidate(schema_name)
+
+    def add_node_index(self, schema_name: str, key: str) -> None:
+        """Index a top-level key of the node bodies.
+
+        `get_nodes(filters={key: ...})` then looks rows
+        up through the index instead of scanning the table.
+
+        Params:
+            schema_name (str): Name to prepend to tables.
+            key (str): Top-level key of the node bodies.
+
+        Returns:
+            None
+        """
+        sql_text = self._read_sql_file("create-node-index.sql", schema_name)
+        sql_text = sql_text.replace("{{key_sql}}", _body_key_sql(key))
+        sql_text = sql_text.replace("{{key}}", key)
+        self._cursor.execute(sql_text)
 
     def add_node(self, schema_name: str, node_id: str, node_body: Dict) -> None:
         """Adds a 'node' to SQLite db.
@@ -97,8 +586,8 @@ class Database:
             None
         """
         sql_text = self._read_sql_file("insert-node.sql", schema_name)
-        self._cursor.execute(sql_text, (node_id, json.dumps(node_body)))
-        self._connection.commit()
+        self._cursor.execute(sql_text, (node_id, _json.dumps(node_body)))
+        self._invalidate(schema_name)
 
     def add_nodes(self, schema_name: str, nodes: List[Tuple[str, str]]) -> None:
         """Adds many 'node' objects to SQLite db.
@@ -114,10 +603,44 @@ class Database:
         Returns:
             None
         """
-        # bulk insert operation
-        sql_text = self._read_sql_file("insert-node.sql", schema_name)
-        self._cursor.executemany(sql_text, nodes)
-        self._connection.commit()
+        self._insert_rows(
+            schema_name=schema_name,
+            file_name="insert-nodes.sql",
+            row_file_name="insert-node.sql",
+            values_sql=NODE_VALUES_SQL,
+            rows=nodes,
+        )
+
+    def add_nodes_iter(self,
+                       schema_name: str,
+                       nodes: Iterable[Tuple[str, str]],
+                       chunk_size: int = INSERT_CHUNK_SIZE,
+                       commit_every: int = 1) -> None:
+        """Adds 'node' objects from any iterable to SQLite db.
+
+        Only `chunk_size` nodes are held in memory at a time, so
+        generators (e.g., rows parsed from a file) can be loaded
+        without building a list first.
+
+        Example:
+            db.add_nodes_iter(
+                schema_name,
+                ((row["id"], row["body"]) for row in csv.DictReader(f)),
+            )
+
+        Params:
+            schema_name (str): Schema name for all nodes.
+            nodes (Iterable[Tuple[str, str]]): Nodes in `(node_id, node_body)`
+                format, the body is a JSON string like in `add_nodes`.
+            chunk_size (int): Nodes inserted at a time.
+            commit_every (int): Chunks written per transaction.
+                Defaults to `1`. Inside a `transaction()` everything is
+                committed with the outer transaction.
+
+        Returns:
+            None
+        """
+        self._add_rows_iter(self.add_nodes, schema_name, nodes, chunk_size, commit_every)
 
     def add_edge(self,
                  schema_name: str,
@@ -149,9 +672,9 @@ class Database:
             source_schema_name if source_schema_name else schema_name,
             target_id,
             target_schema_name if target_schema_name else schema_name,
-            json.dumps(properties)
+            _json.dumps(properties)
         ))
-        self._connection.commit()
+        self._invalidate(schema_name)
 
     def add_edges(self,
                   schema_name: str,
@@ -168,9 +691,109 @@ class Database:
         Returns:
             None
         """
-        sql_text = self._read_sql_file("insert-edge.sql", schema_name)
-        self._cursor.executemany(sql_text, edges)
-        self._connection.commit()
+        self._insert_rows(
+            schema_name=schema_name,
+            file_name="insert-edges.sql",
+            row_file_name="insert-edge.sql",
+            values_sql=EDGE_VALUES_SQL,
+            rows=edges,
+        )
+
+    def add_edges_iter(self,
+                       schema_name: str,
+                       edges: Iterable[Tuple],
+                       chunk_size: int = INSERT_CHUNK_SIZE,
+                       commit_every: int = 1) -> None:
+        """Adds 'edge' rows from any iterable to SQLite db.
+
+        Streams edges like `add_nodes_iter`.
+
+        Params:
+            schema_name (str): Schema name for edge table.
+            edges (Iterable[Tuple]): Edges in the `add_edges` tuple format.
+            chunk_size (int): Edges inserted at a time.
+            commit_every (int): Chunks written per transaction.
+                Defaults to `1`.
+
+        Returns:
+            None
+        """
+        self._add_rows_iter(self.add_edges, schema_name, edges, chunk_size, commit_every)
+
+    def _add_rows_iter(self,
+                       add_rows: Callable[[str, List[Tuple]], None],
+                       schema_name: str,
+                       rows: Iterable[Tuple],
+                       chunk_size: int,
+                       commit_every: int) -> None:
+        """Adds rows from an iterable in chunks.
+
+        Params:
+            add_rows (Callable): Bulk insert, `add_nodes` or `add_edges`.
+            schema_name (str): Schema name for the table.
+            rows (Iterable[Tuple]): Rows to insert.
+            chunk_size (int): Rows inserted at a time.
+            commit_every (int): Chunks written per transaction.
+
+        Returns:
+            None
+        """
+        rows = iter(rows)
+        done = False
+        while not done:
+            with self.transaction():
+                for _ in range(commit_every):
+                    chunk = list(itertools.islice(rows, chunk_size))
+                    if not chunk:
+                        done = True
+                        break
+                    add_rows(schema_name, chunk)
+
+    def _insert_rows(self,
+                     schema_name: str,
+                     file_name: str,
+                     row_file_name: str,
+                     values_sql: str,
+                     rows: List[Tuple]) -> None:
+        """Bulk inserts rows with multi-row `VALUES` statements.
+
+        Rows are sent in chunks as large as the host parameter
+        limit allows (`MAX_VARIABLE_NUMBER`), each chunk is a single
+        statement. Leftover rows use the single-row statement with
+        `executemany`, so only two SQL strings exist per schema.
+
+        Params:
+            schema_name (str): Schema name for the table.
+            file_name (str): Multi-row SQL file with `{{values}}`.
+            row_file_name (str): Single-row SQL file.
+            values_sql (str): Host parameters for a single row.
+            rows (List[Tuple]): Rows to insert.
+
+        Returns:
+            None
+        """
+        rows_per_chunk = MAX_VARIABLE_NUMBER // values_sql.count("?")
+        chunked_row_count = len(rows) - len(rows) % rows_per_chunk
+
+        with self.transaction():
+            if chunked_row_count:
+                sql_text = _render_values_sql(
+                    self._read_sql_file(file_name, schema_name),
+                    values_sql,
+                    rows_per_chunk,
+                )
+                for start in range(0, chunked_row_count, rows_per_chunk):
+                    chunk = rows[start:start + rows_per_chunk]
+                    self._cursor.execute(
+                        sql_text,
+                        list(itertools.chain.from_iterable(chunk)),
+                    )
+
+            if chunked_row_count < len(rows):
+                sql_text = self._read_sql_file(row_file_name, schema_name)
+                self._cursor.executemany(sql_text, rows[chunked_row_count:])
+
+        self._invalidate(schema_name)
 
     def update_schema(self, schema_name: str, new_schema_name: str) -> None:
         """Updates a 'schema' in the SQLite db.
@@ -184,8 +807,14 @@ class Database:
         """
         sql_text = self._read_sql_file("update-schema.sql", schema_name)
         sql_text = sql_text.replace("{{new_schema_name}}", new_schema_name)
-        self._cursor.executescript(sql_text)
-        self._connection.commit()
+        with self.transaction():
+            self._execute_script(sql_text)
+            # recreates the full-text index under the new name,
+            # the renamed tables are left as they are
+            self.add_schema(new_schema_name)
+        self._sql_by_schema.pop(schema_name, None)
+        self._fts_by_schema.pop(schema_name, None)
+        self._invalidate(schema_name)
 
     def update_node(self,
                     schema_name: str,
@@ -202,8 +831,8 @@ class Database:
             None
         """
         sql_text = self._read_sql_file("update-node.sql", schema_name)
-        self._cursor.execute(sql_text, (json.dumps(node_body), node_id))
-        self._connection.commit()
+        self._cursor.execute(sql_text, (_json.dumps(node_body), node_id))
+        self._invalidate(schema_name)
 
     def update_edge(self,
                     schema_name: str,
@@ -222,8 +851,8 @@ class Database:
             None
         """
         sql_text = self._read_sql_file("update-edge.sql", schema_name)
-        self._cursor.execute(sql_text, (json.dumps(properties), source_id, target_id))
-        self._connection.commit()
+        self._cursor.execute(sql_text, (_json.dumps(properties), source_id, target_id))
+        self._invalidate(schema_name)
 
     def delete_schema(self, schema_name: str) -> None:
         """Removes a 'schema' from the SQLite db.
@@ -235,8 +864,10 @@ class Database:
             None
         """
         sql_text = self._read_sql_file("delete-schema.sql", schema_name)
-        self._cursor.executescript(sql_text)
-        self._connection.commit()
+        self._execute_script(sql_text)
+        self._sql_by_schema.pop(schema_name, None)
+        self._fts_by_schema.pop(schema_name, None)
+        self._invalidate(schema_name)
 
     def delete_node(self, schema_name: str, node_id: str) -> None:
         """Removes a 'node' from the SQLite db.
@@ -249,16 +880,32 @@ class Database:
         """
         sql_text = self._read_sql_file("delete-node.sql", schema_name)
         self._cursor.execute(sql_text, (node_id,))
-        self._connection.commit()
+        self._invalidate(schema_name)
 
     def delete_nodes(self, schema_name: str, node_ids: List[str]) -> None:
-        """This bulk deletes 'nodes' in one transaction."""
-        sql_text = self._read_sql_file("delete-nodes.sql", schema_name)
-        node_list = (", ").join(f"'{node}'" for node in node_ids)
-        nodes = f"({node_list})"
-        sql_text = sql_text.replace("{{node_ids}}", nodes)
-        self._cursor.execute(sql_text)
-        self._connection.commit()
+        """This bulk deletes 'nodes' in one transaction.
+
+        IDs are bound as parameters in chunks of up to
+        `MAX_VARIABLE_NUMBER` per statement.
+
+        Params:
+            schema_name (str): Name to prepend to the table.
+            node_ids (List[str]): IDs of the nodes to delete.
+
+        Returns:
+            None
+        """
+        with self.transaction():
+            for start in range(0, len(node_ids), MAX_VARIABLE_NUMBER):
+                chunk = node_ids[start:start + MAX_VARIABLE_NUMBER]
+                sql_text = _render_values_sql(
+                    self._read_sql_file("delete-nodes.sql", schema_name),
+                    "?",
+                    len(chunk),
+                )
+                self._cursor.execute(sql_text, chunk)
+
+        self._invalidate(schema_name)
 
     def delete_edge(self, schema_name: str, source_id: str, target_id: str) -> None:
         """Removes one 'edge' row from the SQLite db.
@@ -273,7 +920,7 @@ class Database:
         """
         sql_text = self._read_sql_file("delete-edge.sql", schema_name)
         self._cursor.execute(sql_text, (source_id, target_id,))
-        self._connection.commit()
+        self._invalidate(schema_name)
 
     def delete_edges(self, schema_name: str, source_or_target_id: str) -> None:
         """Removes all 'edge' rows from the SQLite db.
@@ -287,13 +934,18 @@ class Database:
         """
         sql_text = self._read_sql_file("delete-edges.sql", schema_name)
         self._cursor.execute(sql_text, (source_or_target_id, source_or_target_id,))
-        self._connection.commit()
+        self._invalidate(schema_name)
 
     def get_schemas(self, schema_name: Optional[str] = None) -> List[Union[Tuple, sqlite3.Row]]:
         """Retrieves all schemas matching schema name.
 
-        Executes a `LIKE` operation on the `sqlite_master`
-        table to retrieve table names (schemas).
+        Names without a `%` wildcard match the start of the
+        `_nodes` and `_edges` table names in `sqlite_master`
+        (a prefix probe). Names containing a `%` wildcard, or
+        no name, execute a `LIKE` operation anywhere in the name.
+
+        Note: plain names used to match anywhere in the table
+        name, use e.g. `"%name"` for the old behavior.
 
         Params:
             schema_name (str|None): Schema to search for.
@@ -302,11 +954,15 @@ class Database:
         Returns:
             results (List(Tuple)): List of all matching schemas.
         """
-        sql_text = self._read_sql_file("select-schemas.sql", schema_name)
+        if schema_name and "%" not in schema_name:
+            sql_text = self._read_sql_file("select-schema.sql")
+            return self._read_cursor().execute(sql_text, (_escape_like(schema_name),)).fetchall()
+
+        sql_text = self._read_sql_file("select-schemas.sql")
 
         # sqlite will turn `None` to `null`, so we use an emptry string for the
         # concat operation in the `LIKE` clause
-        return self._cursor.execute(sql_text, (schema_name or "",)).fetchall()
+        return self._read_cursor().execute(sql_text, (schema_name or "",)).fetchall()
 
     def get_node(self, schema_name: str, node_id: str) -> Union[Tuple, sqlite3.Row]:
         """Retrieve one node from the database.
@@ -319,67 +975,170 @@ class Database:
             result (Tuple): Tuple of the row fetched.
         """
         sql_text = self._read_sql_file("select-node.sql", schema_name)
-        return self._cursor.execute(sql_text, (node_id,)).fetchone()
+        return self._cached_query(
+            schema_name, ("get_node", node_id),
+            lambda: self._read_cursor().execute(sql_text, (node_id,)).fetchone(),
+        )
+
+    def count_nodes(self, schema_name: str) -> int:
+        """Count the nodes of a schema.
+
+        Params:
+            schema_name (str): Schema name to count.
+
+        Returns:
+            count (int): Number of nodes.
+        """
+        sql_text = self._read_sql_file("count-nodes.sql", schema_name)
+        return self._read_cursor().execute(sql_text).fetchone()[0]
+
+    def get_all_nodes(self,
+                      schema_name: str,
+                      tuples: bool = False) -> List[Union[Tuple, sqlite3.Row]]:
+        """Retrieve all nodes from a schema name.
+
+        Params:
+            schema_name (str): Schema name to search with.
+            tuples (bool): Return plain tuples, see `iter_all_nodes`.
+
+        Returns:
+            results (List): All node rows.
+        """
+        return list(self.iter_all_nodes(schema_name, tuples=tuples))
 
-    def get_all_nodes(self, schema_name: str) -> List[Union[Tuple, sqlite3.Row]]:
-        """Retrieve all nodes from a schema name."""
+    def iter_all_nodes(self,
+                       schema_name: str,
+                       chunk_size: int = FETCH_CHUNK_SIZE,
+                       tuples: bool = False) -> Iterator[Union[Tuple, sqlite3.Row]]:
+        """Stream all nodes from a schema name.
+
+        Params:
+            schema_name (str): Schema name to search with.
+            chunk_size (int): Rows fetched from SQLite at a time.
+            tuples (bool): Yield plain tuples even when the `Database`
+                uses `sqlite3.Row`, which skips building a `Row` per
+                result in bulk exports. Defaults to `False`.
+
+        Yields:
+            row (Tuple): One node row at a time.
+        """
         sql_text = self._read_sql_file("select-all-nodes.sql", schema_name)
-        return self._cursor.execute(sql_text).fetchall()
+        yield from self._iter_rows(sql_text, chunk_size, tuples)
 
     def get_nodes(self,
                   schema_name: str,
                   node_id: Optional[str] = None,
                   node_body: Optional[Dict] = None,
-                  operator: str = "or") -> List[Union[Tuple, sqlite3.Row]]:
+                  operator: str = "or",
+                  filters: Optional[Dict[str, Any]] = None,
+                  predicates: Optional[List[Tuple[str, str, Any]]] = None) -> List[Union[Tuple, sqlite3.Row]]:
         """Retrieves all nodes matching schema name and params.
 
         Executes a `LIKE` operation on an included `body` in params,
         will execute an `=` operation on `id` in params. The
+        `<schema_name>_nodes_fts` full-text index picks the rows
+        the `LIKE` is checked against, when the schema has one.
+        `filters` compare top-level body keys exactly, keys
+        indexed with `add_node_index` avoid a table scan.
 
         Params:
             schema_name (str): Name to prepend to tables.
             node_id: (str|None): Node ID to pass for search.
             node_body (Dict): The data representing a node to search on.
-            operator (str): Operator to use for `node_id` and `node_body`, defaults to "or".
-                Options include: "or", "and", "not". Note: Cannot use "not" on `node_id`.
+            operator (str): Operator to use for `node_id` and `node_body`,
+                defaults to "or". Options include: "or", "and", "not".
+                Note: Cannot use "not" on `node_id`.
+            filters (Dict[str, Any]): Top-level body keys and the values
+                they must equal, all filters must match. They're combined
+                with `AND` whatever the `operator`.
+            predicates (List[Tuple[str, str, Any]]): `(json_path, operator, value)`
+                comparisons on the body, e.g., `("$.age", ">", 2)`. Operators
+                are in `PREDICATE_OPERATORS`, all predicates must match
+                (also combined with `AND`, like `filters`).
+
+        Raises:
+            DisallowedOperatorError: An operator isn't allowed.
 
         Returns:
-            None
+            results (List): All nodes matching the parameters passed.
         """
 
-        if operator.lower() not in ALLOWED_OPERATORS:
+        operator = operator.lower()
+        if operator not in ALLOWED_OPERATORS:
             msg = f"Illegal operator passed to query: {operator}"
             raise DisallowedOperatorError(msg)
 
-        sql_text = self._read_sql_file("select-nodes.sql", schema_name)
-
+        # only the clauses are part of the SQL text, values are bound
+        # as parameters so SQLite can reuse the prepared statement
+        sql_clauses = []
         sql_params = []
 
         if node_id:
-            sql_params.append("id = '{node_id}'".format(node_id=node_id))
+            sql_clauses.append('"id" = ?')
+            sql_params.append(node_id)
 
         if node_body:
-            json_search = 'json_extract(body, "$") LIKE \'%{node_body}%\''.format(
-                node_body=json.dumps(node_body),
-            )
-            # sanitize Dict input from string dump to
-            # remove trailing curly braces and compress to
-            # database stored format
-
-            # replace "%{"data": "here"}%"
-            # to "%"data": "here"%"
-            json_search = json_search.replace("%{", "%")
-            json_search = json_search.replace("}%", "%")
-
-            # remove ": ", they're stored without spaces
-            json_search = json_search.replace(": ", ":")
-
-            sql_params.append(json_search)
-
-        sql_params = f" {operator} ".join(sql_params)
-        sql_text = sql_text.replace("{{params}}", sql_params)
-
-        return self._cursor.execute(sql_text).fetchall()
+            # compact JSON without the outer braces matches
+            # the stored (minified) body as a substring
+            compact_body = _json.dumps(node_body)[1:-1]
+            body_sql = "json_extract(body, '$') LIKE ? ESCAPE '\\'"
+            body_params = [f"%{_escape_like(compact_body)}%"]
+
+            # the full-text index narrows the rows down to candidates,
+            # `LIKE` keeps the match exact
+            fts_query = _fts_phrase(compact_body)
+            if fts_query and self._has_fts(schema_name):
+                fts_table = f"{schema_name}_nodes_fts"
+                body_sql = (
+                    f"(rowid IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)"
+                    f" AND {body_sql})"
+                )
+                body_params.insert(0, fts_query)
+
+            sql_clauses.append(body_sql)
+            sql_params.extend(body_params)
+
+        params_sql = OPERATOR_SQL[operator].join(sql_clauses)
+
+        if filters or predicates:
+            # `IS` also matches `None` (JSON null)
+            body_predicates = [
+                (_body_key_sql(key), "is", value)
+                for key, value in (filters or {}).items()
+            ]
+            for json_path, predicate_operator, value in predicates or []:
+                predicate_operator = predicate_operator.lower()
+                if predicate_operator not in PREDICATE_OPERATORS:
+                    msg = f"Illegal operator passed to query: {predicate_operator}"
+                    raise DisallowedOperatorError(msg)
+                body_predicates.append((_json_path_sql(json_path), predicate_operator, value))
+
+            predicate_clauses = []
+            for path_sql, predicate_operator, value in body_predicates:
+                predicate_clauses.append(f"{path_sql} {predicate_operator.upper()} ?")
+                # objects and arrays come back from `json_extract` as JSON text
+                if isinstance(value, (dict, list)):
+                    value = _json.dumps(value)
+                sql_params.append(value)
+
+            # `operator` only joins the `id`/`body` clauses,
+            # filters and predicates must always match
+            predicates_sql = f"({' AND '.join(predicate_clauses)})"
+            if params_sql:
+                params_sql = f"({params_sql}) AND {predicates_sql}"
+            else:
+                params_sql = predicates_sql
+
+        sql_text = _render_params_sql(
+            self._read_sql_file("select-nodes.sql", schema_name),
+            params_sql,
+        )
+
+        # a copy, so callers can't change the cached list
+        return list(self._cached_query(
+            schema_name, ("fetchall", sql_text, tuple(sql_params)),
+            lambda: self._read_cursor().execute(sql_text, sql_params).fetchall(),
+        ))
 
     def get_edge(self,
                  schema_name: str,
@@ -400,13 +1159,88 @@ class Database:
         """
 
         sql_text = self._read_sql_file("select-edge.sql", schema_name)
-        edge = self._cursor.execute(sql_text, (source_id, target_id,)).fetchone()
+        edge = self._cached_query(
+            schema_name, ("get_edge", source_id, target_id),
+            lambda: self._read_cursor().execute(sql_text, (source_id, target_id,)).fetchone(),
+        )
         return edge
 
-    def get_all_edges(self, schema_name: str) -> List[Union[Tuple, sqlite3.Row]]:
-        """Retrieve all edges from a schema name."""
+    def count_edges(self, schema_name: str) -> int:
+        """Count the edges of a schema.
+
+        Params:
+            schema_name (str): Schema name to count.
+
+        Returns:
+            count (int): Number of edges.
+        """
+        sql_text = self._read_sql_file("count-edges.sql", schema_name)
+        return self._read_cursor().execute(sql_text).fetchone()[0]
+
+    def get_all_edges(self,
+                      schema_name: str,
+                      tuples: bool = False) -> List[Union[Tuple, sqlite3.Row]]:
+        """Retrieve all edges from a schema name.
+
+        Params:
+            schema_name (str): Schema name to search with.
+            tuples (bool): Return plain tuples, see `iter_all_edges`.
+
+        Returns:
+            results (List): All edge rows.
+        """
+        return list(self.iter_all_edges(schema_name, tuples=tuples))
+
+    def iter_all_edges(self,
+                       schema_name: str,
+                       chunk_size: int = FETCH_CHUNK_SIZE,
+                       tuples: bool = False) -> Iterator[Union[Tuple, sqlite3.Row]]:
+        """Stream all edges from a schema name.
+
+        Params:
+            schema_name (str): Schema name to search with.
+            chunk_size (int): Rows fetched from SQLite at a time.
+            tuples (bool): Yield plain tuples even when the `Database`
+                uses `sqlite3.Row`, which skips building a `Row` per
+                result in bulk exports. Defaults to `False`.
+
+        Yields:
+            row (Tuple): One edge row at a time.
+        """
         sql_text = self._read_sql_file("select-all-edges.sql", schema_name)
-        return self._cursor.execute(sql_text).fetchall()
+        yield from self._iter_rows(sql_text, chunk_size, tuples)
+
+    def _iter_rows(self,
+                   sql_text: str,
+                   chunk_size: int,
+                   tuples: bool = False) -> Iterator[Union[Tuple, sqlite3.Row]]:
+        """Stream the rows of a query in chunks.
+
+        Uses its own cursor, so other calls on this `Database`
+        can be made while the rows are consumed.
+
+        Params:
+            sql_text (str): Query to execute.
+            chunk_size (int): Rows fetched from SQLite at a time.
+            tuples (bool): Return plain tuples instead of the
+                connection's row factory.
+
+        Yields:
+            row (Tuple): One row at a time.
+        """
+        cursor = self._read_cursor().connection.cursor()
+        if tuples:
+            # only this cursor, the connection keeps its row factory
+            cursor.row_factory = None
+        try:
+            cursor.execute(sql_text)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
 
     def get_edges(self,
                   schema_name: str,
@@ -428,30 +1262,36 @@ class Database:
             result (List): All results matching the parameters passed.
                 Uses an `OR` operation on each parameter.
         """
-        sql_text = self._read_sql_file("select-edges.sql", schema_name)
-
+        sql_clauses = []
         sql_params = []
 
-        # create a param set for each param sent in
-        # columns need to be in double quotes
+        # create a clause for each param sent in,
+        # values are bound as parameters
         if source_id:
-            sql_params.append(""" "source" = '{source_id}'""".format(source_id=source_id))
+            sql_clauses.append('"source" = ?')
+            sql_params.append(source_id)
         if target_id:
-            sql_params.append(""" "target" = '{target_id}'""".format(target_id=target_id))
+            sql_clauses.append('"target" = ?')
+            sql_params.append(target_id)
         if properties:
-            sql_params.append(""" "properties" = '{properties}'""".format(properties=properties))
-
-        # add `OR`s between each param
-        sql_params = " OR ".join(sql_params)
-
-        # for some reason the `?` variable in SQLite does something weird
-        # to double quoted params passed as a string
-        # I don't know why, so we replace a placeholder (which is bad, but whatever)
-        sql_text = sql_text.replace("{{params}}", sql_params)
-
-        return self._cursor.execute(sql_text).fetchall()
+            sql_clauses.append('"properties" = json(?)')
+            sql_params.append(_json.dumps(properties))
+
+        # add `OR`s between each clause
+        sql_text = _render_params_sql(
+            self._read_sql_file("select-edges.sql", schema_name),
+            " OR ".join(sql_clauses),
+        )
+
+        # a copy, so callers can't change the cached list
+        return list(self._cached_query(
+            schema_name, ("fetchall", sql_text, tuple(sql_params)),
+            lambda: self._read_cursor().execute(sql_text, sql_params).fetchall(),
+        ))
 
-    def execute_sql(self, sql_text: str) -> Optional[List]:
+    def execute_sql(self,
+                    sql_text: str,
+                    validated: bool = False) -> Optional[List]:
         """Executes arbitrary SQL.
 
         Only use this if you know what you're
@@ -459,28 +1299,35 @@ class Database:
 
         Params:
             sql_text (str): Query to execute.
+            validated (bool): Skip the `sqlite3.complete_statement`
+                check when the caller knows the statement is complete.
+                Defaults to `False`.
 
         Returns:
-            results (List): A list of SQLite rows.
+            results (List | None): A list of SQLite rows, `None` if
+                the statement doesn't return rows.
 
         Raises:
             IncompleteStatementError: An incomplete
                 SQL statement was used.
+            sqlite3.Error: SQLite failed to execute the statement.
         """
-        if sqlite3.complete_statement(sql_text):
-
-            try:
-                self._cursor.execute(sql_text)
-
-                if "select" in sql_text.lower():
-                    return self._cursor.fetchall()
-
-            except sqlite3.Error as e:
-                print("SQLite raised an exception: ", e)
-        else:
+        if not validated and not sqlite3.complete_statement(sql_text):
             raise IncompleteStatementError
 
-    def execute_sql_script(self, sql_text: str) -> Optional[List]:
+        self._cursor.execute(sql_text)
+        # arbitrary SQL can change any schema
+        self._invalidate()
+
+        # statements that return rows (`SELECT`, `PRAGMA`,
+        # `... RETURNING`) describe their columns
+        if self._cursor.description is not None:
+            return self._cursor.fetchall()
+        return None
+
+    def execute_sql_script(self,
+                           sql_text: str,
+                           validated: bool = False) -> None:
         """Executes arbitrary SQL scripts.
 
         Only use this if you know what you're
@@ -488,24 +1335,21 @@ class Database:
 
         Params:
             sql_text (str): Queries to execute.
+            validated (bool): Skip the `sqlite3.complete_statement`
+                check when the caller knows the script is complete.
+                Defaults to `False`.
 
         Returns:
-            results (List): A list of SQLite rows.
+            None: `executescript` doesn't return rows, use
+                `execute_sql` for queries.
 
         Raises:
             IncompleteStatementError: An incomplete
                 SQL statement was used.
+            sqlite3.Error: SQLite failed to execute the script.
         """
-        if sqlite3.complete_statement(sql_text):
-
-            try:
-                self._cursor.executescript(sql_text)
-
-                if "select" in sql_text.lower():
-                    return self._cursor.fetchall()
-
-            except sqlite3.Error as e:
-                print("SQLite raised an exception: ", e.args[0])
-        else:
+        if not validated and not sqlite3.complete_statement(sql_text):
             raise IncompleteStatementError
 
+        self._cursor.executescript(sql_text)
+        self._invalidate()
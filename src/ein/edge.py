@@ -6,6 +6,16 @@ from .node import Node
 class Edge:
     """Edge object from the SQLite db."""
 
+    # no per-instance `__dict__`, graphs hold many edges
+    __slots__ = (
+        "schema_name",
+        "source",
+        "source_schema_name",
+        "target",
+        "target_schema_name",
+        "properties",
+    )
+
     def __init__(self,
                  schema_name: str,
                  source: Node,
@@ -29,13 +39,17 @@ class Edge:
         self.target_schema_name = target.schema_name
         self.properties = properties
 
-    def __eq__(self, source: Optional[Node] = None, target: Optional[Node] = None) -> bool:
-
-        if source and target:
-            return (
-                self.source.id == source.id and self.target.id == target.id
-            )
-        else:
-            super().__eq__(self)
-
+    def __eq__(self, other: object) -> bool:
+        """Edges are equal when they link the same source and target.
 
+        The schema isn't compared, this is the same key as
+        `Graph.edges` (and node IDs alone key `Graph.nodes`).
+        """
+        if not isinstance(other, Edge):
+            return NotImplemented
+        return (
+            self.source.id == other.source.id and self.target.id == other.target.id
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.source.id, self.target.id))
@@ -1,27 +1,57 @@
-import json
+import re
 import sqlite3
-from typing import Dict, List, Set, Union
+import sys
+from array import array
+from typing import Dict, List, Set, Tuple, Union
 
+from . import _json
+from ._lazy import CACHE_SIZE, EdgeView, NodeView
 from .database import Database
 from .edge import Edge
 from .node import Node
 
+SCHEMA_TABLE_PATTERN = re.compile(r"^(?P<schema_name>.+)_(?:nodes|edges)$")
+
 
 class Graph:
     """Graph representation from SQLite db."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self,
+                 db_path: str,
+                 uri: bool = False,
+                 readers: int = 0,
+                 lazy: bool = False,
+                 cache_size: int = CACHE_SIZE) -> None:
         """Database initialization from new or existing path.
 
         Params:
             db_path (str): Path to a new SQLite database
                 or existing database.
+            uri (bool): Treat `db_path` as a SQLite URI,
+                see `Database`. Defaults to `False`.
+            readers (int): Read-only connections for lookups,
+                see `Database`. Defaults to `0`.
+            lazy (bool): Load nodes and edges from the db when they're
+                accessed instead of all of them on init. `nodes` and
+                `edges` are then dict-like views that keep the last
+                `cache_size` objects in memory. Defaults to `False`.
+            cache_size (int): Nodes and edges cached when `lazy`.
         """
         self.db_path = db_path
-        self.database = Database(db_path=db_path, row_factory=True)
+        self.database = Database(
+            db_path=db_path,
+            row_factory=True,
+            uri=uri,
+            readers=readers,
+        )
         self.schemas = self._all_schemas()
-        self.nodes = self._all_schema_nodes()
-        self.edges = self._all_schema_edges()
+        self.lazy = lazy
+        if lazy:
+            self.nodes = NodeView(self, cache_size)
+            self.edges = EdgeView(self, cache_size)
+        else:
+            self.nodes = self._all_schema_nodes()
+            self.edges = self._all_schema_edges()
 
     def _all_schemas(self) -> Set[str]:
         """Fetch all schemas on init.
@@ -29,14 +59,14 @@ class Graph:
         If the database already exists then we
         need a `Set` of all schema names that exist.
         This requires de-duping the `<schema_name>_nodes`
-        and `<schema_name>_edges`. We then split the
-        prefix out of the table name.
+        and `<schema_name>_edges`. We then strip the
+        suffix from the table name, schema names may
+        contain underscores.
         """
         schema_rows = self.database.get_schemas()
-        schema_list = [schema["name"] for schema in schema_rows]
-        return set(
-            [schema_name.split("_")[0] for schema_name in schema_list]
-        )
+        matches = map(SCHEMA_TABLE_PATTERN.match, (schema["name"] for schema in schema_rows))
+        # every node and edge of a schema shares one string
+        return {sys.intern(match.group("schema_name")) for match in matches if match}
 
     def _all_schema_nodes(self) -> Dict[str, Node]:
         """Fetch all nodes for all schemas.
@@ -50,15 +80,16 @@ class Graph:
             nodes (Dict[str, Node]): Dict of node IDs and node objects
                 or an empty dictionary.
         """
+        # plain tuples, streamed in one pass per schema
         nodes = {}
         for schema_name in self.schemas:
-            node_rows = self.database.get_all_nodes(schema_name=schema_name)
-            for node_row in node_rows:
-                node = self._create_node(schema_name=schema_name, node_row=node_row)
+            node_rows = self.database.iter_all_nodes(schema_name=schema_name, tuples=True)
+            for node_id, body in node_rows:
+                node = Node(schema_name=schema_name, id=node_id, raw_body=body)
                 nodes[node.id] = node
         return nodes
 
-    def _all_schema_edges(self) -> List[Edge]:
+    def _all_schema_edges(self) -> Dict[Tuple[str, str], Edge]:
         """Fetch all edges for all schemas.
 
         Gets all edges from every schema that we have.
@@ -67,16 +98,46 @@ class Graph:
             None
 
         Returns:
-            edges (List[Edge]): List of edge objects or an empty list.
+            edges (Dict[Tuple[str, str], Edge]): Dict of `(source_id, target_id)`
+                and edge objects or an empty dictionary.
         """
-        edges = []
+        # bound once, this runs for every edge in the db
+        get_node = self.nodes.get
+        intern = sys.intern
+        loads = _json.loads
+
+        edges = {}
         for schema_name in self.schemas:
-            edge_rows = self.database.get_all_edges(schema_name=schema_name)
-            for edge_row in edge_rows:
-                edge = self._create_edge(schema_name=schema_name, edge_row=edge_row)
-                edges.append(edge)
+            edge_rows = self.database.iter_all_edges(schema_name=schema_name, tuples=True)
+            for source_id, _, target_id, _, properties in edge_rows:
+                # the same string objects as the `Node.id`s
+                source_id = intern(source_id)
+                target_id = intern(target_id)
+                edges[(source_id, target_id)] = Edge(
+                    schema_name=schema_name,
+                    source=get_node(source_id),
+                    target=get_node(target_id),
+                    properties=loads(properties),
+                )
         return edges
 
+    def reload(self) -> None:
+        """Re-read schemas, nodes and edges from the db.
+
+        Picks up writes made outside of this `Graph`, e.g.,
+        with `Database.execute_sql`, without opening a new one.
+
+        Returns:
+            None
+        """
+        self.schemas = self._all_schemas()
+        if self.lazy:
+            self.nodes.invalidate()
+            self.edges.invalidate()
+        else:
+            self.nodes = self._all_schema_nodes()
+            self.edges = self._all_schema_edges()
+
     def add_schema(self, schema_name: str) -> None:
         """Adds a schema.
 
@@ -89,13 +150,15 @@ class Graph:
         self.database.add_schema(schema_name=schema_name)
         self.schemas.add(schema_name)
 
-    def add_node(self, schema_name: str, node: Node) -> None:
+    def add_node(self, schema_name: str, node: Node, refresh: bool = False) -> None:
         """Adds a node.
 
         Params:
             schema_name (str): Schema name for the DB.
             node (Node): A node instance to add to the db
                 and graph.
+            refresh (bool): Re-read the node from the DB
+                instead of keeping `node`. Defaults to `False`.
 
         Returns:
             None
@@ -105,6 +168,9 @@ class Graph:
             node_id=node.id,
             node_body=node.body
         )
+        if not refresh:
+            self.nodes[node.id] = node
+            return
         new_node = self.database.get_node(schema_name=schema_name, node_id=node.id)
         self.nodes[new_node["id"]] = self._create_node(
             schema_name=schema_name,
@@ -117,11 +183,9 @@ class Graph:
         Inserts many nodes to the database, does not support multiple
         schemas in one bulk insert.
 
-        TODO:
-            * Change nodes addition to do a
-                `SELECT ... FROM ... WHERE node_id IN (...)`
-                Because I still like the idea of only ever having the true DB representation
-                of data in the Graph obj.
+        The given nodes are kept in `self.nodes` as-is, they
+        aren't re-read from the DB (like single adds without
+        `refresh`).
 
         Params:
             schema_name (str): Schema name for the DB.
@@ -130,20 +194,24 @@ class Graph:
         Returns:
             None
         """
-        self.database.add_nodes(
-            schema_name=schema_name,
-            nodes=[(node.id, json.dumps(node.body)) for node in nodes],
-        )
+        # one transaction, rows are dumped as they're inserted
+        with self.database.transaction():
+            self.database.add_nodes_iter(
+                schema_name=schema_name,
+                nodes=((node.id, _json.dumps(node.body)) for node in nodes),
+            )
         for node in nodes:
             self.nodes[node.id] = node
 
-    def add_edge(self, edge: Edge) -> None:
+    def add_edge(self, edge: Edge, refresh: bool = False) -> None:
         """Adds an edge.
 
         Params:
             schema_name (str): Schema name for the DB.
             edge (Edge): An edge instance to add to the db
                 and graph.
+            refresh (bool): Re-read the edge from the DB
+                instead of keeping `edge`. Defaults to `False`.
 
         Returns:
             None
@@ -156,16 +224,17 @@ class Graph:
             target_schema_name=edge.target_schema_name,
             properties=edge.properties,
         )
+        if not refresh:
+            self.edges[(edge.source.id, edge.target.id)] = edge
+            return
         edge_data = self.database.get_edge(
             schema_name=edge.schema_name,
             source_id=edge.source.id,
             target_id=edge.target.id,
         )
-        self.edges.append(
-            self._create_edge(
-                schema_name=edge.schema_name,
-                edge_row=edge_data,
-            )
+        self.edges[(edge.source.id, edge.target.id)] = self._create_edge(
+            schema_name=edge.schema_name,
+            edge_row=edge_data,
         )
 
     def add_edges(self, schema_name: str, edges: List[Edge]) -> None:
@@ -176,15 +245,9 @@ class Graph:
         should match. JSON data for properties is dumped as string
         here because we're passing a tuple into the database function.
 
-        We don't pull freshly added edges from the DB for the
-        updated `self.edges` list like we do on single adds/updates/etc.
-        It would be more cumbersome to select, so just avoided doing it.
-
-        TODO:
-            * Change edges addition to do a
-                `SELECT ... FROM ... WHERE source_id IN (...) OR target_id IN (...)`
-                Because I still like the idea of only ever having the true DB representation
-                of data in the Graph obj.
+        The given edges are kept in `self.edges` as-is, they
+        aren't re-read from the DB (like single adds without
+        `refresh`).
 
         Params:
             schema_name (str): Schema name for the DB table.
@@ -193,23 +256,57 @@ class Graph:
         Returns:
             None
         """
-        self.database.add_edges(
-            schema_name=schema_name,
-            edges=[(
-                   edge.source.id, edge.source_schema_name,
-                   edge.target.id, edge.target_schema_name,
-                   json.dumps(edge.properties),
-                   ) for edge in edges],
-        )
-        self.edges += edges
+        with self.database.transaction():
+            self.database.add_edges_iter(
+                schema_name=schema_name,
+                edges=((
+                    edge.source.id, edge.source_schema_name,
+                    edge.target.id, edge.target_schema_name,
+                    _json.dumps(edge.properties),
+                ) for edge in edges),
+            )
+        for edge in edges:
+            self.edges[(edge.source.id, edge.target.id)] = edge
+
+    def add_bulk(self, schema_name: str, nodes: List[Node], edges: List[Edge]) -> None:
+        """Adds many nodes and edges at once.
 
-    def update_node(self, node: Node) -> None:
+        Nodes then edges are inserted in a single transaction,
+        the graph is only updated once both have been written.
+
+        Params:
+            schema_name (str): Schema name for the DB tables.
+            nodes (List[Node]): Nodes to add to the database.
+            edges (List[Edge]): Edges to add to the database.
+
+        Returns:
+            None
+        """
+        with self.database.transaction():
+            self.database.add_nodes_iter(
+                schema_name=schema_name,
+                nodes=((node.id, _json.dumps(node.body)) for node in nodes),
+            )
+            self.database.add_edges_iter(
+                schema_name=schema_name,
+                edges=((
+                    edge.source.id, edge.source_schema_name,
+                    edge.target.id, edge.target_schema_name,
+                    _json.dumps(edge.properties),
+                ) for edge in edges),
+            )
+        self.nodes.update((node.id, node) for node in nodes)
+        self.edges.update(((edge.source.id, edge.target.id), edge) for edge in edges)
+
+    def update_node(self, node: Node, refresh: bool = False) -> None:
         """Updates a node in the DB and graph.
 
         Params:
             node (Node): Updates a node in the DB.
                 Be sure to update the `body` before
                 passing it to be updated.
+            refresh (bool): Re-read the node from the DB
+                instead of keeping `node`. Defaults to `False`.
 
         Returns:
             None
@@ -219,6 +316,9 @@ class Graph:
             node_id=node.id,
             node_body=node.body,
         )
+        if not refresh:
+            self.nodes[node.id] = node
+            return
         updated_node_data = self.database.get_node(
             schema_name=node.schema_name,
             node_id=node.id
@@ -230,7 +330,7 @@ class Graph:
 
         self.nodes[updated_node.id] = updated_node
 
-    def update_edge(self, edge: Edge) -> None:
+    def update_edge(self, edge: Edge, refresh: bool = False) -> None:
         """Updates a edge in the DB and graph.
 
         Does not change the `source` or `target`
@@ -240,6 +340,8 @@ class Graph:
             edge (Edge): Updates a edge in the DB.
                 Be sure to update the `properties`
                 before passing it to be updated.
+            refresh (bool): Re-read the edge from the DB
+                instead of keeping `edge`. Defaults to `False`.
 
         Returns:
             None
@@ -250,6 +352,9 @@ class Graph:
             target_id=edge.target.id,
             properties=edge.properties,
         )
+        if not refresh:
+            self.edges[(edge.source.id, edge.target.id)] = edge
+            return
         updated_edge_data = self.database.get_edge(
             schema_name=edge.schema_name,
             source_id=edge.source.id,
@@ -260,11 +365,7 @@ class Graph:
             edge_row=updated_edge_data,
         )
 
-        for edge in self.edges:
-            if edge.__eq__(updated_edge.source, updated_edge.target):
-                self.edges.remove(edge)
-
-        self.edges.append(updated_edge)
+        self.edges[(updated_edge.source.id, updated_edge.target.id)] = updated_edge
 
     def get_schema(self, schema_name: str) -> Union[str, None]:
         """Fetch a schema.
@@ -294,10 +395,7 @@ class Graph:
         Returns:
             node (Node | None): Node object, if exists.
         """
-        if self.nodes[node_id]:
-            return self.nodes[node_id]
-        else:
-            return None
+        return self.nodes.get(node_id)
 
     def get_edge(self, source: Node, target: Node) -> Union[Edge, None]:
         """Fetch a edge.
@@ -312,20 +410,64 @@ class Graph:
         Returns:
             edge (Edge | None): Edge object, if exists.
         """
-        for edge in self.edges:
-            if edge.__eq__(source=source, target=target):
-                return edge
-        return None
+        return self.edges.get((source.id, target.id))
+
+    def build_csr(self) -> Tuple[List[str], array, array]:
+        """Compressed sparse row (CSR) arrays of the edges.
+
+        Node IDs are mapped to integer indices, the successors
+        of the node at index `i` are then
+        `indices[indptr[i]:indptr[i + 1]]`. The arrays are
+        contiguous buffers, e.g., `numpy.frombuffer(indices, dtype="q")`
+        wraps them without copying. Rebuild after the graph changes.
+
+        Params:
+            None
+
+        Returns:
+            csr (Tuple[List[str], array, array]): Node IDs by index,
+                `indptr` and `indices` arrays of signed 64-bit ints.
+        """
+        node_ids = list(self.nodes)
+        index_by_id = {node_id: index for index, node_id in enumerate(node_ids)}
+
+        # edges can point at nodes that aren't loaded
+        for edge_key in self.edges:
+            for node_id in edge_key:
+                if node_id not in index_by_id:
+                    index_by_id[node_id] = len(node_ids)
+                    node_ids.append(node_id)
+
+        indptr = array("q", [0]) * (len(node_ids) + 1)
+        for source_id, _ in self.edges:
+            indptr[index_by_id[source_id] + 1] += 1
+        for index in range(len(node_ids)):
+            indptr[index + 1] += indptr[index]
+
+        indices = array("q", [0]) * len(self.edges)
+        next_position = indptr[:-1]
+        for source_id, target_id in self.edges:
+            source_index = index_by_id[source_id]
+            indices[next_position[source_index]] = index_by_id[target_id]
+            next_position[source_index] += 1
+
+        return node_ids, indptr, indices
 
     def delete_schema(self, schema_name: str) -> None:
         """Remove a schema from the DB and graph."""
         self.database.delete_schema(schema_name=schema_name)
         self.schemas.remove(schema_name)
+        if self.lazy:
+            self.nodes.invalidate()
+            self.edges.invalidate()
 
     def delete_node(self, node: Node) -> None:
         """Remove a node from the DB and graph."""
         self.database.delete_node(schema_name=node.schema_name, node_id=node.id)
-        self.nodes.pop(node.id)
+        if self.lazy:
+            self.nodes.evict(node.id)
+        else:
+            self.nodes.pop(node.id, None)
 
     def delete_edge(self, edge: Edge) -> None:
         """Remove an edge from the DB and graph."""
@@ -334,9 +476,10 @@ class Graph:
             source_id=edge.source.id,
             target_id=edge.target.id,
         )
-        for e in self.edges:
-            if edge.__eq__(e.source, e.target):
-                self.edges.remove(e)
+        if self.lazy:
+            self.edges.evict((edge.source.id, edge.target.id))
+        else:
+            self.edges.pop((edge.source.id, edge.target.id), None)
 
     def _create_node(self, schema_name: str, node_row: sqlite3.Row) -> Node:
         """A Node constructor.
@@ -354,7 +497,7 @@ class Graph:
         return Node(
             schema_name=schema_name,
             id=node_row["id"],
-            body=json.loads(node_row["body"]),
+            raw_body=node_row["body"],
         )
 
     def _create_edge(self, schema_name: str, edge_row: sqlite3.Row) -> Edge:
@@ -372,8 +515,8 @@ class Graph:
         """
         return Edge(
             schema_name=schema_name,
-            source=self.get_node(edge_row["source"]),
-            target=self.get_node(edge_row["target"]),
-            properties=json.loads(edge_row["properties"]),
+            source=self.nodes.get(edge_row["source"]),
+            target=self.nodes.get(edge_row["target"]),
+            properties=_json.loads(edge_row["properties"]),
         )
 
@@ -1,18 +1,61 @@
-from typing import Dict
+import sys
+from typing import Dict, Optional, Union
+
+from . import _json
 
 
 class Node:
     """Node object from the SQLite db."""
 
+    # no per-instance `__dict__`, graphs hold many nodes
+    __slots__ = ("schema_name", "id", "_body", "_raw_body")
+
     def __init__(self,
                  schema_name: str,
                  id: str,
-                 body: Dict) -> None:
-        """Representation of 'node' from {{schema_name}}_nodes."""
-        self.schema_name = schema_name
-        self.id = id
-        self.body = body
+                 body: Optional[Dict] = None,
+                 raw_body: Optional[Union[str, bytes]] = None) -> None:
+        """Representation of 'node' from {{schema_name}}_nodes.
+
+        Params:
+            schema_name (str): Schema name for the node table.
+            id (str): ID of the node.
+            body (Optional[Dict]): The data representing a node.
+            raw_body (Optional[str|bytes]): The body as JSON text, decoded
+                the first time `body` is read. Used for rows from the db
+                so unread bodies are never parsed.
+
+        Returns:
+            None
+        """
+        # one shared string per schema name and ID across nodes,
+        # edges and their dict keys
+        self.schema_name = sys.intern(schema_name) if type(schema_name) is str else schema_name
+        self.id = sys.intern(id) if type(id) is str else id
+        self._body = body
+        self._raw_body = raw_body
+
+    @property
+    def body(self) -> Optional[Dict]:
+        if self._raw_body is not None:
+            self._body = _json.loads(self._raw_body)
+            self._raw_body = None
+        return self._body
+
+    @body.setter
+    def body(self, body: Optional[Dict]) -> None:
+        self._body = body
+        self._raw_body = None
+
+    def __eq__(self, other: object) -> bool:
+        """Nodes are equal when they have the same ID, as in `Graph.nodes`."""
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        # `str` caches its own hash
+        return hash(self.id)
 
     def __repr__(self) -> str:
         pass
-
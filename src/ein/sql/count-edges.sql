@@ -0,0 +1,5 @@
+SELECT
+    COUNT(*)
+FROM
+    {{schema_name}}_edges
+;
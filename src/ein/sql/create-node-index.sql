@@ -0,0 +1,3 @@
+-- expression index on one top-level key of the node bodies
+CREATE INDEX IF NOT EXISTS "{{schema_name}}_nodes_{{key}}_idx"
+    ON {{schema_name}}_nodes({{key_sql}});
@@ -1,12 +1,10 @@
--- create nodes table with index
+-- create nodes table, the primary key indexes `id`.
+-- it keeps its rowid, the full-text index refers to rows by it
 CREATE TABLE IF NOT EXISTS {{schema_name}}_nodes (
     id TEXT NOT NULL PRIMARY KEY,
     body JSON
 );
 
-CREATE INDEX IF NOT EXISTS idx_id
-    ON {{schema_name}}_nodes(id);
-
 -- create edges table with weighted properties
 CREATE TABLE IF NOT EXISTS {{schema_name}}_edges (
     source TEXT,
@@ -19,6 +17,43 @@ CREATE TABLE IF NOT EXISTS {{schema_name}}_edges (
     FOREIGN KEY(target) REFERENCES nodes(id) ON DELETE CASCADE
 );
 
-CREATE UNIQUE INDEX IF NOT EXISTS idx_source_target
+CREATE UNIQUE INDEX IF NOT EXISTS idx_{{schema_name}}_source_target
     ON {{schema_name}}_edges(source, target);
 
+-- full-text index over node bodies, kept in sync by triggers
+-- (external content, rows are read from the nodes table)
+CREATE VIRTUAL TABLE IF NOT EXISTS {{schema_name}}_nodes_fts USING fts5(
+    body,
+    content='{{schema_name}}_nodes',
+    content_rowid='rowid'
+);
+
+CREATE TRIGGER IF NOT EXISTS {{schema_name}}_nodes_fts_insert
+    AFTER INSERT ON {{schema_name}}_nodes
+BEGIN
+    INSERT INTO {{schema_name}}_nodes_fts(rowid, body)
+        VALUES (new.rowid, new.body);
+END;
+
+CREATE TRIGGER IF NOT EXISTS {{schema_name}}_nodes_fts_delete
+    AFTER DELETE ON {{schema_name}}_nodes
+BEGIN
+    INSERT INTO {{schema_name}}_nodes_fts({{schema_name}}_nodes_fts, rowid, body)
+        VALUES ('delete', old.rowid, old.body);
+END;
+
+CREATE TRIGGER IF NOT EXISTS {{schema_name}}_nodes_fts_update
+    AFTER UPDATE OF body ON {{schema_name}}_nodes
+BEGIN
+    INSERT INTO {{schema_name}}_nodes_fts({{schema_name}}_nodes_fts, rowid, body)
+        VALUES ('delete', old.rowid, old.body);
+    INSERT INTO {{schema_name}}_nodes_fts(rowid, body)
+        VALUES (new.rowid, new.body);
+END;
+
+-- index rows that existed before the fts table
+INSERT INTO {{schema_name}}_nodes_fts({{schema_name}}_nodes_fts) VALUES ('rebuild');
+
+-- seed planner stats for the new tables
+ANALYZE {{schema_name}}_nodes;
+ANALYZE {{schema_name}}_edges;
@@ -1,5 +1,4 @@
 DELETE FROM {{schema_name}}_nodes
 WHERE
-    "id" IN {{node_ids}}
+    "id" IN ({{values}})
 ;
-
@@ -1,2 +1,3 @@
+DROP TABLE IF EXISTS {{schema_name}}_nodes_fts;
 DROP TABLE IF EXISTS {{schema_name}}_nodes;
 DROP TABLE IF EXISTS {{schema_name}}_edges;
@@ -0,0 +1,8 @@
+INSERT INTO {{schema_name}}_nodes
+(
+    id,
+    body
+)
+VALUES
+    {{values}}
+;
@@ -0,0 +1,7 @@
+-- connection tuning applied on every connect
+PRAGMA journal_mode = {{journal_mode}};
+PRAGMA synchronous = {{synchronous}};
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = {{cache_size}};
+PRAGMA mmap_size = {{mmap_size}};
+PRAGMA busy_timeout = 5000;
@@ -0,0 +1,17 @@
+SELECT
+    name
+FROM
+    sqlite_master
+WHERE
+    type = 'table'
+    AND
+    name LIKE ? || '%' ESCAPE '\'
+    AND
+    name NOT LIKE 'sqlite\_%' ESCAPE '\'
+    AND
+    (
+        name LIKE '%\_nodes' ESCAPE '\'
+        OR
+        name LIKE '%\_edges' ESCAPE '\'
+    )
+;
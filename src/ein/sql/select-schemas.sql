@@ -6,4 +6,12 @@ WHERE
     type = 'table'
     AND
     tbl_name LIKE '%' || ? || '%'
+    AND
+    tbl_name NOT LIKE 'sqlite\_%' ESCAPE '\'
+    AND
+    (
+        tbl_name LIKE '%\_nodes' ESCAPE '\'
+        OR
+        tbl_name LIKE '%\_edges' ESCAPE '\'
+    )
 ;
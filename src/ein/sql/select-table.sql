@@ -0,0 +1,9 @@
+SELECT
+    name
+FROM
+    sqlite_master
+WHERE
+    type = 'table'
+    AND
+    name = ?
+;
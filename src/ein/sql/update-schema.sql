@@ -1,3 +1,11 @@
+-- the fts table is created again for the new name
+DROP TRIGGER IF EXISTS {{schema_name}}_nodes_fts_insert;
+DROP TRIGGER IF EXISTS {{schema_name}}_nodes_fts_delete;
+DROP TRIGGER IF EXISTS {{schema_name}}_nodes_fts_update;
+DROP TABLE IF EXISTS {{schema_name}}_nodes_fts;
+
+-- index names carry the schema, recreated for the new name too
+DROP INDEX IF EXISTS idx_{{schema_name}}_source_target;
+
 ALTER TABLE {{schema_name}}_nodes RENAME TO {{new_schema_name}}_nodes;
 ALTER TABLE {{schema_name}}_edges RENAME TO {{new_schema_name}}_edges;
-
@@ -3,18 +3,77 @@ import sqlite3
 
 import pytest
 
-from conftest import TEST_DB, TEST_SCHEMA
-from src.ein.database import (Database, DisallowedOperatorError,
-                              IncompleteStatementError)
+from conftest import POPULATED_NODES, TEST_DB, TEST_SCHEMA
+from src.ein import _json
+from src.ein.database import (CACHED_SCRIPTS, CACHED_STATEMENTS, Database,
+                              DisallowedOperatorError,
+                              IncompleteStatementError, _json_path_sql,
+                              _render_params_sql, _render_values_sql,
+                              _split_sql_script)
+
+OTHER_DATA = ("string-one", "string-two")
+POPULATED_EDGE = ("select-test", TEST_SCHEMA, "select-test-2", TEST_SCHEMA, "null")
+
+# checks of the rows stored in the test schema
+NODES_SQL = f"SELECT * FROM {TEST_SCHEMA}_nodes;"
+EDGES_SQL = f"SELECT * FROM {TEST_SCHEMA}_edges;"
+NODE_COUNT_SQL = f"SELECT count(*) FROM {TEST_SCHEMA}_nodes;"
+EDGE_COUNT_SQL = f"SELECT count(*) FROM {TEST_SCHEMA}_edges;"
+
+
+def _test_node(node_id, body_id=None):
+    """A node dict with the shared `other-data` body."""
+    return {
+        "id": node_id,
+        "body": {
+            "id": body_id or node_id,
+            "other-data": list(OTHER_DATA),
+        },
+    }
 
 
 def test_database_init(db_setup):
     """`Database` object init has proper connection properties."""
 
-    db = Database(TEST_DB)
+    db = Database(TEST_DB, uri=True)
 
     assert isinstance(db._connection, sqlite3.Connection)
     assert isinstance(db._cursor, sqlite3.Cursor)
+    assert not hasattr(db, "__dict__")
+
+    # one cursor is reused for every call
+    cursor = db._cursor
+    db.add_schema(TEST_SCHEMA)
+    with db.transaction():
+        db.add_node(TEST_SCHEMA, "cursor-test", {})
+    assert db._cursor is cursor
+    assert db._read_cursor() is cursor
+    db.close()
+
+
+def test_database_init_pragmas(tmp_path):
+    """Connections use WAL and `synchronous=NORMAL` unless overridden."""
+
+    db = Database(str(tmp_path / "wal.db"), row_factory=False)
+    connection = db._connection
+    assert connection.execute("PRAGMA journal_mode;").fetchone() == ("wal",)
+    # NORMAL
+    assert connection.execute("PRAGMA synchronous;").fetchone() == (1,)
+
+    db = Database(
+        str(tmp_path / "pragmas.db"),
+        row_factory=False,
+        journal_mode="DELETE",
+        synchronous="FULL",
+        cache_size=-2000,
+        mmap_size=0,
+    )
+    connection = db._connection
+    assert connection.execute("PRAGMA journal_mode;").fetchone() == ("delete",)
+    # FULL
+    assert connection.execute("PRAGMA synchronous;").fetchone() == (2,)
+    assert connection.execute("PRAGMA cache_size;").fetchone() == (-2000,)
+    assert connection.execute("PRAGMA mmap_size;").fetchone() == (0,)
 
 
 def test_database_executes_arbitrary_sql(db_setup):
@@ -29,12 +88,26 @@ def test_database_executes_arbitrary_sql(db_setup):
     with pytest.raises(IncompleteStatementError):
         db_setup.execute_sql(incomplete_statement)
 
+    # the caller vouches for the statement
+    assert db_setup.execute_sql("SELECT 'test'", validated=True) == [("test",)]
+
+    # rows are returned for any statement that has them
+    assert db_setup.execute_sql("PRAGMA query_only;") == [(0,)]
+    assert db_setup.execute_sql("CREATE TABLE selected (id);") is None
+
+    with pytest.raises(sqlite3.OperationalError):
+        db_setup.execute_sql("SELECT * FROM missing_table;")
+
 
 def test_database_reads_sql_file(db_setup):
     """`Database` objects can read SQL files and insert schemas."""
 
     sql_text = db_setup._read_sql_file("insert-node.sql", TEST_SCHEMA)
 
+    # rendered once per schema, later reads return the same string
+    assert db_setup._read_sql_file("insert-node.sql", TEST_SCHEMA) is sql_text
+    assert db_setup._read_sql_file("pragmas.sql") is db_setup._read_sql_file("pragmas.sql")
+
     expected_sql_text = f"""
     INSERT INTO {TEST_SCHEMA}_nodes
     (
@@ -80,17 +153,22 @@ def test_database_add_schema(db_setup):
     WHERE
         type = 'index'
         AND
-        tbl_name LIKE 'test%';
+        tbl_name IN ('test_nodes', 'test_edges');
     """
 
     schema_tables = db_setup.execute_sql(check_schema_tables_sql)
     schema_indexes = db_setup.execute_sql(check_schema_indexes_sql)
 
-    expected_schema_tables = [("test_nodes",), ("test_edges",)]
-    expected_indexes = [("sqlite_autoindex_test_nodes_1",), ("idx_id",), ("sqlite_autoindex_test_edges_1",), ("idx_source_target",)]
+    expected_schema_tables = [
+        ("test_nodes",), ("test_edges",),
+        # full-text index and its shadow tables
+        ("test_nodes_fts",), ("test_nodes_fts_data",), ("test_nodes_fts_idx",),
+        ("test_nodes_fts_docsize",), ("test_nodes_fts_config",),
+    ]
+    expected_indexes = [("sqlite_autoindex_test_nodes_1",), ("sqlite_autoindex_test_edges_1",), ("idx_test_source_target",)]
 
-    assert schema_tables == expected_schema_tables
-    assert schema_indexes == expected_indexes
+    assert set(schema_tables) == set(expected_schema_tables)
+    assert set(schema_indexes) == set(expected_indexes)
 
 
 def test_database_add_nodes(db_setup):
@@ -98,49 +176,27 @@ def test_database_add_nodes(db_setup):
 
     db_setup.add_schema(TEST_SCHEMA)
 
-    node_one = {
-        "id": "add-nodes-test1",
-        "body": {
-            "id": "add-nodes-test1",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
-    node_two = {
-        "id": "add-nodes-test2",
-        "body": {
-            "id": "add-nodes-test2",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
+    node_one = _test_node("add-nodes-test1")
+    node_two = _test_node("add-nodes-test2")
 
     db_setup.add_nodes(
         TEST_SCHEMA,
         [
-            (node_one["id"], json.dumps(node_one["body"])),
-            (node_two["id"], json.dumps(node_two["body"])),
+            (node_one["id"], _json.dumps(node_one["body"])),
+            (node_two["id"], _json.dumps(node_two["body"])),
         ],
     )
 
-    check_node_sql = """
-    SELECT * FROM {schema_name}_nodes;
-    """.format(schema_name=TEST_SCHEMA)
-
-    nodes_data = db_setup.execute_sql(check_node_sql)
+    nodes_data = db_setup.execute_sql(NODES_SQL)
 
     expected_nodes_data = [
         (
             node_one["id"],
-            json.dumps(node_one["body"]).replace(" ", ""),
+            _json.dumps(node_one["body"]),
         ),
         (
             node_two["id"],
-            json.dumps(node_two["body"]).replace(" ", ""),
+            _json.dumps(node_two["body"]),
         ),
     ]
 
@@ -152,24 +208,11 @@ def test_database_add_node(db_setup):
 
     db_setup.add_schema(TEST_SCHEMA)
 
-    node = {
-        "id": "add-node-test",
-        "body": {
-            "id": "add-node-test",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
+    node = _test_node("add-node-test")
 
     db_setup.add_node(TEST_SCHEMA, node["id"], node)
 
-    check_node_sql = """
-    SELECT * FROM {schema_name}_nodes;
-    """.format(schema_name=TEST_SCHEMA)
-
-    nodes_data = db_setup.execute_sql(check_node_sql)
+    nodes_data = db_setup.execute_sql(NODES_SQL)
 
     expected_nodes_data = [('add-node-test', '{"id":"add-node-test","body":{"id":"add-node-test","other-data":["string-one","string-two"]}}')]
 
@@ -181,16 +224,7 @@ def test_database_update_node(db_setup):
 
     db_setup.add_schema(TEST_SCHEMA)
 
-    node_one = {
-        "id": "update-edge-test",
-        "body": {
-            "id": "add-edge-test",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
+    node_one = _test_node("update-edge-test", body_id="add-edge-test")
 
     updated_body = {
         "id": "add-edge-test",
@@ -204,13 +238,9 @@ def test_database_update_node(db_setup):
 
     db_setup.update_node(TEST_SCHEMA, node_one["id"], updated_body)
 
-    check_edge_sql = """
-    SELECT * FROM {schema_name}_nodes;
-    """.format(schema_name=TEST_SCHEMA)
-
-    node_data = db_setup.execute_sql(check_edge_sql)
+    node_data = db_setup.execute_sql(NODES_SQL)
 
-    expected_node_data = [(node_one["id"], json.dumps(updated_body).replace(" ", ""))]
+    expected_node_data = [(node_one["id"], '{"id":"add-edge-test","some-other-data":["string-three","string-four"]}')]
 
     assert node_data == expected_node_data
 
@@ -220,37 +250,16 @@ def test_database_add_edge(db_setup):
 
     db_setup.add_schema(TEST_SCHEMA)
 
-    node_one = {
-        "id": "add-edge-test",
-        "body": {
-            "id": "add-edge-test",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
-    node_two = {
-        "id": "add-edge-test2",
-        "body": {
-            "id": "add-edge-test2",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
-
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
+    node_one = _test_node("add-edge-test")
+    node_two = _test_node("add-edge-test2")
 
-    db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
-
-    check_edge_sql = """
-    SELECT * FROM {schema_name}_edges;
-    """.format(schema_name=TEST_SCHEMA)
+    # one commit for the setup writes
+    with db_setup.transaction():
+        db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
+        db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
+        db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
 
-    edges_data = db_setup.execute_sql(check_edge_sql)
+    edges_data = db_setup.execute_sql(EDGES_SQL)
 
     expected_edges_data = [
         (
@@ -265,63 +274,44 @@ def test_database_add_edge(db_setup):
     assert edges_data == expected_edges_data
 
     # Test unique index on FK constraints
-    with pytest.raises(Exception) as e:  # noqa F841
+    with pytest.raises(sqlite3.IntegrityError, match="UNIQUE constraint failed"):
         db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
 
+    # every schema gets its own index
+    db_setup.add_schema("other")
+    db_setup.add_edge("other", node_one["id"], node_two["id"], TEST_SCHEMA, TEST_SCHEMA)
+
+    with pytest.raises(sqlite3.IntegrityError, match="UNIQUE constraint failed"):
+        db_setup.add_edge("other", node_one["id"], node_two["id"], TEST_SCHEMA, TEST_SCHEMA)
+
 
 def test_database_add_edges(db_setup):
     """Add edges to a new schema and retrieve it."""
 
     db_setup.add_schema(TEST_SCHEMA)
 
-    node_one = {
-        "id": "add-edges-test",
-        "body": {
-            "id": "add-edges-test",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
-    node_two = {
-        "id": "add-edges-test2",
-        "body": {
-            "id": "add-edges-test2",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
-    node_three = {
-        "id": "add-edges-test3",
-        "body": {
-            "id": "add-edges-test3",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
+    node_one = _test_node("add-edges-test")
+    node_two = _test_node("add-edges-test2")
+    node_three = _test_node("add-edges-test3")
 
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
-    db_setup.add_node(TEST_SCHEMA, node_three["id"], node_three)
+    db_setup.add_nodes(
+        TEST_SCHEMA,
+        [
+            (node_one["id"], _json.dumps(node_one)),
+            (node_two["id"], _json.dumps(node_two)),
+            (node_three["id"], _json.dumps(node_three)),
+        ],
+    )
 
     db_setup.add_edges(
         TEST_SCHEMA,
         [
-            (node_one["id"], TEST_SCHEMA, node_two["id"], TEST_SCHEMA, json.dumps({})),
-            (node_two["id"], TEST_SCHEMA, node_three["id"], TEST_SCHEMA, json.dumps({})),
+            (node_one["id"], TEST_SCHEMA, node_two["id"], TEST_SCHEMA, "{}"),
+            (node_two["id"], TEST_SCHEMA, node_three["id"], TEST_SCHEMA, "{}"),
         ],
     )
 
-    check_edge_sql = """
-    SELECT * FROM {schema_name}_edges;
-    """.format(schema_name=TEST_SCHEMA)
-
-    edges_data = db_setup.execute_sql(check_edge_sql)
+    edges_data = db_setup.execute_sql(EDGES_SQL)
 
     expected_edges_data = [
         (
@@ -343,9 +333,17 @@ def test_database_add_edges(db_setup):
     assert edges_data == expected_edges_data
 
     # Test unique index on FK constraints
-    with pytest.raises(Exception) as e:  # noqa F841
+    with pytest.raises(sqlite3.IntegrityError, match="UNIQUE constraint failed"):
         db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
 
+    # every schema gets its own index
+    db_setup.add_schema("other")
+    other_edges = [(node_one["id"], TEST_SCHEMA, node_two["id"], TEST_SCHEMA, "{}")]
+    db_setup.add_edges("other", other_edges)
+
+    with pytest.raises(sqlite3.IntegrityError, match="UNIQUE constraint failed"):
+        db_setup.add_edges("other", other_edges)
+
 
 def test_database_add_multi_schema_edge(db_setup):
     """Add an edge that has nodes in 2 places."""
@@ -409,26 +407,8 @@ def test_database_update_edge(db_setup):
 
     db_setup.add_schema(TEST_SCHEMA)
 
-    node_one = {
-        "id": "update-edge-test",
-        "body": {
-            "id": "update-edge-test",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
-    node_two = {
-        "id": "update-edge-test2",
-        "body": {
-            "id": "update-edge-test2",
-            "other-data": [
-                "string-one",
-                "string-two"
-            ]
-        }
-    }
+    node_one = _test_node("update-edge-test")
+    node_two = _test_node("update-edge-test2")
 
     property = {
         "find-me": "something"
@@ -441,11 +421,7 @@ def test_database_update_edge(db_setup):
 
     db_setup.update_edge(TEST_SCHEMA, node_one["id"], node_two["id"], property)
 
-    check_edge_sql = """
-    SELECT * FROM {schema_name}_edges;
-    """.format(schema_name=TEST_SCHEMA)
-
-    edges_data = db_setup.execute_sql(check_edge_sql)
+    edges_data = db_setup.execute_sql(EDGES_SQL)
 
     expected_edges_data = [
         (
@@ -453,7 +429,7 @@ def test_database_update_edge(db_setup):
             TEST_SCHEMA,
             node_two["id"],
             TEST_SCHEMA,
-            json.dumps(property).replace(" ", "")
+            '{"find-me":"something"}'
         )
     ]
 
@@ -467,214 +443,73 @@ def test_database_update_schema(db_setup):
 
     db_setup.update_schema(TEST_SCHEMA, "new_name")
 
-    check_schema_tables_sql = """
-    SELECT
-        name
-    FROM
-        sqlite_master
-    WHERE
-        type = 'table'
-        AND
-        tbl_name LIKE 'new_name%';
-    """
-
-    schema_data = db_setup.execute_sql(check_schema_tables_sql)
+    # exact table name lookups
+    schema_data = db_setup.get_schemas("new_name")
 
     expected_schema_tables = [("new_name_nodes",), ("new_name_edges",)]
 
     assert schema_data == expected_schema_tables
+    assert db_setup.get_schemas(TEST_SCHEMA) == []
 
-
-def test_database_get_node(db_setup):
-    """Selects node based on id."""
-
-    db_setup.add_schema(TEST_SCHEMA)
-
-    node_one = {
-        "id": "select-node-test",
-        "body": "selected-body"
-    }
-
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-
-    results_body = db_setup.get_node(
-        TEST_SCHEMA,
-        node_id=node_one["id"]
+    # the edge index follows the rename
+    index_names = db_setup.execute_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%';"
     )
-
-    assert "select-node-test" in str(results_body)
-    # tuple of 2 columns
-    assert len(results_body) == 2
-
-
-def test_database_get_all_nodes(db_setup):
-    """Selects all nodes in a schema."""
-
-    db_setup.add_schema(TEST_SCHEMA)
-
-    node_one = {
-        "id": "select-all-nodes-test",
-        "body": "selected-body"
-    }
-
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-
-    results_body = db_setup.get_all_nodes(TEST_SCHEMA)
-
-    assert "select-all-nodes-test" in str(results_body)
-    # tuple of 2 columns
-    assert len(results_body) == 1
-
-
-def test_database_get_nodes(db_setup):
+    assert index_names == [("idx_new_name_source_target",)]
+
+
+@pytest.mark.parametrize(
+    "method, args, expected",
+    [
+        ("get_node", ("select-test",), ("select-test", _json.dumps(POPULATED_NODES[0]))),
+        ("get_all_nodes", (), [(node["id"], _json.dumps(node)) for node in POPULATED_NODES]),
+        ("get_edge", ("select-test", "select-test-2"), POPULATED_EDGE),
+        ("get_all_edges", (), [POPULATED_EDGE]),
+    ],
+)
+def test_database_get(db_populated, method, args, expected):
+    """Selects nodes and edges by key or for a whole schema."""
+
+    assert getattr(db_populated, method)(TEST_SCHEMA, *args) == expected
+
+
+@pytest.mark.parametrize(
+    "node_id, node_body, operator, expected_ids",
+    [
+        (None, {"body": "selected-body"}, "or", {"select-test", "select-test-2"}),
+        ("missing-test", {"body": "selected-body"}, "or", {"select-test", "select-test-2"}),
+        ("select-test-2", {"body": "selected-body"}, "and", {"select-test-2"}),
+        ("select-test-2", {"body": "other-body"}, "NOT", {"select-test-2"}),
+    ],
+)
+def test_database_get_nodes(db_populated, node_id, node_body, operator, expected_ids):
     """Selects nodes based on params."""
 
-    db_setup.add_schema(TEST_SCHEMA)
-
-    node_one = {
-        "id": "select-nodes-test",
-        "body": "selected-body"
-    }
-
-    node_two = {
-        "id": "select-nodes-test-2",
-        "body": "selected-body"
-    }
-
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
-
-    params_body = {
-        "body": "selected-body"
-    }
-
-    results_body = db_setup.get_nodes(TEST_SCHEMA, node_body=params_body)
-
-    assert "selected-body" in str(results_body)
-    assert len(results_body) == 2
-
-    params_id_body = {
-        "body": "selected-body"
-    }
-
-    results_id_body = db_setup.get_nodes(
+    results = db_populated.get_nodes(
         TEST_SCHEMA,
-        node_id="select-node-test-2",
-        node_body=params_id_body,
+        node_id=node_id,
+        node_body=node_body,
+        operator=operator,
     )
 
-    assert "select-nodes-test-2" in str(results_id_body)
-    assert len(results_id_body) == 2
+    assert {row[0] for row in results} == expected_ids
 
-    params_operator = {
-        "body": "selected-body"
-    }
-
-    results_operator = db_setup.get_nodes(
-        TEST_SCHEMA,
-        node_id="select-nodes-test-2",
-        node_body=params_operator,
-        operator="and",
-    )
-
-    assert "select-nodes-test-2" in str(results_operator)
-    assert len(results_operator) == 1
-
-
-def test_database_get_nodes_errors(db_setup):
-    db_setup.add_schema(TEST_SCHEMA)
-
-    node_one = {
-        "id": "select-node-test",
-        "body": "selected-body"
-    }
-
-    node_two = {
-        "id": "select-node-test-2",
-        "body": "selected-body"
-    }
-
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
 
+def test_database_get_nodes_errors(db_populated):
     params_operator = {
         "body": "selected-body"
     }
 
     with pytest.raises(DisallowedOperatorError) as e:  # noqa F841
 
-        db_setup.get_nodes(
+        db_populated.get_nodes(
             TEST_SCHEMA,
-            node_id="select-node-test-2",
+            node_id="select-test-2",
             node_body=params_operator,
             operator="something-wrong",
         )
 
 
-def test_database_get_edge(db_setup):
-    """Queries for edge with a source ID and target ID."""
-
-    db_setup.add_schema(TEST_SCHEMA)
-
-    node_one = {
-        "id": "select-edge-test",
-        "body": "selected-body"
-    }
-
-    node_two = {
-        "id": "select-edge-test-2",
-        "body": "selected-body"
-    }
-
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
-
-    db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
-
-    selected_edge = db_setup.get_edge(
-        TEST_SCHEMA,
-        node_one["id"],
-        node_two["id"]
-    )
-    expected_edge = (node_one["id"], TEST_SCHEMA, node_two["id"], TEST_SCHEMA, 'null')
-
-    assert selected_edge == expected_edge
-
-
-def test_database_get_all_edges(db_setup):
-    """Queries for all edges."""
-
-    db_setup.add_schema(TEST_SCHEMA)
-
-    node_one = {
-        "id": "select-all-edges-test",
-        "body": "selected-body"
-    }
-
-    node_two = {
-        "id": "select-all-edges-test-2",
-        "body": "selected-body"
-    }
-
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
-
-    db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
-
-    selected_edges = db_setup.get_all_edges(TEST_SCHEMA)
-    expected_edges = [
-        (
-            node_one["id"],
-            TEST_SCHEMA,
-            node_two["id"],
-            TEST_SCHEMA,
-            'null'
-        )
-    ]
-
-    assert selected_edges == expected_edges
-
-
 def test_database_get_edges(db_setup):
     """Queries for edges."""
 
@@ -690,8 +525,13 @@ def test_database_get_edges(db_setup):
         "body": "selected-body"
     }
 
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
+    db_setup.add_nodes(
+        TEST_SCHEMA,
+        [
+            (node_one["id"], _json.dumps(node_one)),
+            (node_two["id"], _json.dumps(node_two)),
+        ],
+    )
 
     db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
 
@@ -721,10 +561,17 @@ def test_database_get_schemas(db_setup):
     selected_schemas = db_setup.get_schemas(TEST_SCHEMA)
     expected_schemas = [("test_nodes",), ("test_edges",)]
 
-    assert selected_schemas == expected_schemas
+    # table order isn't part of the API
+    assert set(selected_schemas) == set(expected_schemas)
 
     selected_schemas = db_setup.get_schemas()
-    assert selected_schemas == expected_schemas
+    assert set(selected_schemas) == set(expected_schemas)
+
+    # names without a wildcard match the start of the table name
+    assert set(db_setup.get_schemas("tes")) == set(expected_schemas)
+    assert db_setup.get_schemas("est") == []
+    assert db_setup.get_schemas("t_") == []
+    assert set(db_setup.get_schemas("%est")) == set(expected_schemas)
 
 
 def test_database_delete_node(db_setup):
@@ -741,11 +588,7 @@ def test_database_delete_node(db_setup):
 
     db_setup.delete_node(TEST_SCHEMA, node_one["id"])
 
-    node_count_sql = """
-    SELECT count(*) FROM {schema_name}_nodes;
-    """.format(schema_name=TEST_SCHEMA)
-
-    node_count = db_setup.execute_sql(node_count_sql)
+    node_count = db_setup.execute_sql(NODE_COUNT_SQL)
     expected_node_count = [(0,)]
 
     assert node_count == expected_node_count
@@ -766,16 +609,17 @@ def test_database_delete_nodes(db_setup):
         "body": "selected-body"
     }
 
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
+    db_setup.add_nodes(
+        TEST_SCHEMA,
+        [
+            (node_one["id"], _json.dumps(node_one)),
+            (node_two["id"], _json.dumps(node_two)),
+        ],
+    )
 
     db_setup.delete_nodes(TEST_SCHEMA, [node_one["id"], node_two["id"]])
 
-    node_count_sql = """
-    SELECT count(*) FROM {schema_name}_nodes;
-    """.format(schema_name=TEST_SCHEMA)
-
-    node_count = db_setup.execute_sql(node_count_sql)
+    node_count = db_setup.execute_sql(NODE_COUNT_SQL)
     expected_node_count = [(0,)]
 
     assert node_count == expected_node_count
@@ -806,18 +650,19 @@ def test_database_delete_edge(db_setup):
         "body": "selected-body"
     }
 
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
+    db_setup.add_nodes(
+        TEST_SCHEMA,
+        [
+            (node_one["id"], _json.dumps(node_one)),
+            (node_two["id"], _json.dumps(node_two)),
+        ],
+    )
 
     db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
 
     db_setup.delete_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
 
-    edge_count_sql = """
-    SELECT count(*) FROM {schema_name}_edges;
-    """.format(schema_name=TEST_SCHEMA)
-
-    edge_count = db_setup.execute_sql(edge_count_sql)
+    edge_count = db_setup.execute_sql(EDGE_COUNT_SQL)
     expected_edge_count = [(0,)]
 
     assert edge_count == expected_edge_count
@@ -837,19 +682,413 @@ def test_database_delete_edges(db_setup):
         "body": "selected-body"
     }
 
-    db_setup.add_node(TEST_SCHEMA, node_one["id"], node_one)
-    db_setup.add_node(TEST_SCHEMA, node_two["id"], node_two)
+    db_setup.add_nodes(
+        TEST_SCHEMA,
+        [
+            (node_one["id"], _json.dumps(node_one)),
+            (node_two["id"], _json.dumps(node_two)),
+        ],
+    )
 
     db_setup.add_edge(TEST_SCHEMA, node_one["id"], node_two["id"])
 
     db_setup.delete_edges(TEST_SCHEMA, node_one["id"])
 
-    edge_count_sql = """
-    SELECT count(*) FROM {schema_name}_edges;
-    """.format(schema_name=TEST_SCHEMA)
-
-    edge_count = db_setup.execute_sql(edge_count_sql)
+    edge_count = db_setup.execute_sql(EDGE_COUNT_SQL)
     expected_edge_count = [(0,)]
 
     assert edge_count == expected_edge_count
 
+
+def test_database_transaction(db_setup):
+    """Writes in a transaction commit once, or roll back on errors."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    with db_setup.transaction():
+        db_setup.add_node(TEST_SCHEMA, "transaction-test", {"body": "selected-body"})
+        db_setup.add_node(TEST_SCHEMA, "transaction-test-2", {"body": "selected-body"})
+        assert db_setup._connection.in_transaction
+
+    assert not db_setup._connection.in_transaction
+    assert db_setup.execute_sql(NODE_COUNT_SQL) == [(2,)]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with db_setup.transaction():
+            db_setup.add_node(TEST_SCHEMA, "transaction-test-3", {"body": "selected-body"})
+            # duplicate primary key
+            db_setup.add_node(TEST_SCHEMA, "transaction-test", {"body": "selected-body"})
+
+    assert db_setup.execute_sql(NODE_COUNT_SQL) == [(2,)]
+
+
+def test_database_add_nodes_and_edges_chunked(db_setup):
+    """Bulk adds larger than one multi-row statement insert every row."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    # 2 full statements and a remainder for both tables
+    row_count = 1200
+
+    db_setup.add_nodes(
+        TEST_SCHEMA,
+        [(f"chunked-test-{i}", _json.dumps({"i": i})) for i in range(row_count)],
+    )
+    db_setup.add_edges(
+        TEST_SCHEMA,
+        [
+            ("chunked-test-0", TEST_SCHEMA, f"chunked-test-{i}", TEST_SCHEMA, _json.dumps({"i": i}))
+            for i in range(row_count)
+        ],
+    )
+
+    assert db_setup.execute_sql(NODE_COUNT_SQL) == [(row_count,)]
+    assert db_setup.execute_sql(EDGE_COUNT_SQL) == [(row_count,)]
+    assert db_setup.get_node(TEST_SCHEMA, "chunked-test-1199") == ("chunked-test-1199", '{"i":1199}')
+
+
+def test_database_get_nodes_compact_body(db_setup):
+    """Body searches match lists and values containing separators."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    db_setup.add_node(TEST_SCHEMA, "compact-body-test", {"other-data": ["string-one", "string-two"]})
+    db_setup.add_node(TEST_SCHEMA, "compact-body-test-2", {"text": "key: value"})
+
+    results_list = db_setup.get_nodes(
+        TEST_SCHEMA,
+        node_body={"other-data": ["string-one", "string-two"]},
+    )
+    results_text = db_setup.get_nodes(TEST_SCHEMA, node_body={"text": "key: value"})
+
+    assert [row[0] for row in results_list] == ["compact-body-test"]
+    assert [row[0] for row in results_text] == ["compact-body-test-2"]
+
+
+def test_database_get_edges_parameters(db_setup):
+    """Edge searches bind values, including quotes and properties."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    db_setup.add_edge(TEST_SCHEMA, "select-edges-test", "it's-a-target", properties={"weight": 1})
+    db_setup.add_edge(TEST_SCHEMA, "select-edges-test-2", "select-edges-test-3", properties={"weight": 2})
+
+    results_target = db_setup.get_edges(TEST_SCHEMA, target_id="it's-a-target")
+    results_properties = db_setup.get_edges(TEST_SCHEMA, properties={"weight": 2})
+    results_injection = db_setup.get_edges(TEST_SCHEMA, source_id="' OR '1' = '1")
+
+    assert [row[2] for row in results_target] == ["it's-a-target"]
+    assert [row[0] for row in results_properties] == ["select-edges-test-2"]
+    assert results_injection == []
+
+
+def test_database_delete_nodes_chunked(db_setup):
+    """Bulk deletes larger than one statement remove every node."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    node_ids = [f"delete-nodes-chunked-test-{i}" for i in range(1200)]
+    db_setup.add_nodes(TEST_SCHEMA, [(node_id, "{}") for node_id in node_ids])
+    db_setup.add_node(TEST_SCHEMA, "it's-kept", {})
+
+    db_setup.delete_nodes(TEST_SCHEMA, node_ids)
+
+    assert db_setup.execute_sql(NODE_COUNT_SQL) == [(1,)]
+
+    # each `IN (...)` length is rendered once, within a bound
+    for row_count in range(1, CACHED_STATEMENTS + 10):
+        db_setup.delete_nodes(TEST_SCHEMA, node_ids[:row_count])
+    assert _render_values_sql.cache_info().currsize <= CACHED_STATEMENTS
+
+
+def test_database_iter_all_nodes_and_edges(db_setup):
+    """Streams every node and edge in chunks."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    db_setup.add_nodes(TEST_SCHEMA, [(f"iter-test-{i}", "{}") for i in range(5)])
+    db_setup.add_edge(TEST_SCHEMA, "iter-test-0", "iter-test-1")
+
+    nodes = db_setup.iter_all_nodes(TEST_SCHEMA, chunk_size=2)
+    assert next(nodes) == ("iter-test-0", "{}")
+
+    # the shared cursor can be used mid-stream
+    assert db_setup.get_node(TEST_SCHEMA, "iter-test-4") == ("iter-test-4", "{}")
+    assert [row[0] for row in nodes] == [f"iter-test-{i}" for i in range(1, 5)]
+
+    edges = list(db_setup.iter_all_edges(TEST_SCHEMA, chunk_size=2))
+    assert edges == [("iter-test-0", TEST_SCHEMA, "iter-test-1", TEST_SCHEMA, "null")]
+
+
+def test_database_get_all_nodes_tuples(db_setup_row_factory):
+    """Bulk reads can skip `sqlite3.Row` without changing the connection."""
+
+    db_setup_row_factory.add_schema(TEST_SCHEMA)
+    db_setup_row_factory.add_node(TEST_SCHEMA, "tuple-test", {"key": "value"})
+
+    nodes = db_setup_row_factory.get_all_nodes(TEST_SCHEMA, tuples=True)
+    assert nodes == [("tuple-test", '{"key":"value"}')]
+    assert type(nodes[0]) is tuple
+    assert db_setup_row_factory.get_all_edges(TEST_SCHEMA, tuples=True) == []
+
+    # other queries still use rows
+    assert isinstance(db_setup_row_factory.get_all_nodes(TEST_SCHEMA)[0], sqlite3.Row)
+
+
+def test_database_close(db_setup):
+    """Schemas are analyzed, closing is safe to repeat."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    stats_table_sql = "SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1';"
+    assert db_setup.execute_sql(stats_table_sql) == [("sqlite_stat1",)]
+    # internal tables aren't schemas
+    assert db_setup.get_schemas() == [("test_nodes",), ("test_edges",)]
+
+    db_setup.close()
+    db_setup.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        db_setup.get_schemas()
+
+
+def test_database_readers(tmp_path):
+    """Reads rotate over read-only connections, writes use the writer."""
+
+    db = Database(str(tmp_path / "readers.db"), readers=2)
+    db.add_schema(TEST_SCHEMA)
+    db.add_node(TEST_SCHEMA, "1", {"key": "value"})
+
+    read_cursors = [db._read_cursor() for _ in range(2)]
+    assert read_cursors[0] is not read_cursors[1]
+    assert db._cursor not in read_cursors
+    for cursor in read_cursors:
+        assert cursor.execute("PRAGMA query_only;").fetchone()[0] == 1
+
+    # committed writes are visible to the readers
+    assert db.get_node(TEST_SCHEMA, "1")["id"] == "1"
+    assert len(db.get_all_nodes(TEST_SCHEMA)) == 1
+
+    # uncommitted writes are read on the writer
+    with db.transaction():
+        db.add_node(TEST_SCHEMA, "2", {"key": "value"})
+        assert db._read_cursor() is db._cursor
+        assert db.get_node(TEST_SCHEMA, "2")["id"] == "2"
+
+    db.close()
+
+
+def test_database_get_nodes_full_text_index(db_setup):
+    """Body searches use the full-text index and stay exact."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+    db_setup.add_node(TEST_SCHEMA, "fts-1", {"name": "ein", "age": 12})
+    db_setup.add_node(TEST_SCHEMA, "fts-2", {"name": "spike", "age": 27})
+    db_setup.update_node(TEST_SCHEMA, "fts-2", {"name": "ein", "age": 2})
+
+    def get_ids(**kwargs):
+        rows = db_setup.get_nodes(TEST_SCHEMA, **kwargs)
+        return sorted(row[0] for row in rows)
+
+    assert get_ids(node_body={"name": "ein"}) == ["fts-1", "fts-2"]
+    # same substring semantics as `LIKE` on the last value
+    assert get_ids(node_body={"age": 1}) == ["fts-1"]
+    assert get_ids(node_body={"name": "spike"}) == []
+    assert get_ids(node_id="fts-2", node_body={"age": 12}) == ["fts-1", "fts-2"]
+
+    db_setup.delete_node(TEST_SCHEMA, "fts-1")
+    assert get_ids(node_body={"name": "ein"}) == ["fts-2"]
+
+    db_setup.update_schema(TEST_SCHEMA, "renamed")
+    rows = db_setup.get_nodes("renamed", node_body={"name": "ein"})
+    assert [row[0] for row in rows] == ["fts-2"]
+
+    # schemas without the index fall back to a scan
+    db_setup.execute_sql("DROP TABLE renamed_nodes_fts;")
+    db_setup.execute_sql("DROP TRIGGER renamed_nodes_fts_insert;")
+    db_setup._fts_by_schema.clear()
+    rows = db_setup.get_nodes("renamed", node_body={"name": "ein"})
+    assert [row[0] for row in rows] == ["fts-2"]
+    db_setup.delete_schema("renamed")
+
+
+def test_database_add_nodes_iter(db_setup):
+    """Nodes stream in from a generator, one transaction per chunks."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    nodes = ((str(i), _json.dumps({"value": i})) for i in range(25))
+    db_setup.add_nodes_iter(TEST_SCHEMA, nodes, chunk_size=10, commit_every=2)
+
+    assert db_setup.execute_sql(NODE_COUNT_SQL) == [(25,)]
+    assert db_setup.get_node(TEST_SCHEMA, "24")[1] == '{"value":24}'
+
+    # nothing to insert
+    db_setup.add_nodes_iter(TEST_SCHEMA, iter([]))
+    assert db_setup.execute_sql(NODE_COUNT_SQL) == [(25,)]
+
+    edges = ((str(i), TEST_SCHEMA, str(i + 1), TEST_SCHEMA, "{}") for i in range(24))
+    db_setup.add_edges_iter(TEST_SCHEMA, edges, chunk_size=10)
+    assert db_setup.count_edges(TEST_SCHEMA) == 24
+
+
+def test_database_json_dumps_matches_stored_body(db_setup):
+    """Dumped JSON is the same text SQLite stores, with or without orjson."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    node_body = {"name": "ein", "bebop": ["spike", "faye"], "\u00e9": 1.5}
+    db_setup.add_node(TEST_SCHEMA, "json-1", node_body)
+
+    assert db_setup.get_node(TEST_SCHEMA, "json-1")[1] == _json.dumps(node_body)
+    assert _json.loads(_json.dumps(node_body)) == node_body
+    assert db_setup.get_nodes(TEST_SCHEMA, node_body={"\u00e9": 1.5})[0][0] == "json-1"
+
+    # `json` handles what orjson refuses
+    assert _json.dumps({1: 2 ** 70}) == '{"1":%d}' % 2 ** 70
+
+
+def test_database_get_nodes_matches_escaped_body(db_setup):
+    """Bodies stored with `json.dumps` defaults are found by body search."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+
+    # written like earlier versions did, with `\\u00e9` escapes
+    escaped_body = json.dumps({"name": "caf\u00e9"})
+    db_setup.execute_sql(
+        f"INSERT INTO {TEST_SCHEMA}_nodes (id, body) "
+        f"VALUES ('escaped-1', json('{escaped_body}'));"
+    )
+    db_setup.add_node(TEST_SCHEMA, "escaped-2", {"name": "caf\u00e9"})
+
+    node_ids = [row[0] for row in db_setup.get_nodes(TEST_SCHEMA, node_body={"name": "caf\u00e9"})]
+    assert sorted(node_ids) == ["escaped-1", "escaped-2"]
+
+
+def test_database_get_nodes_filters(db_setup):
+    """Body key filters match exactly and use expression indexes."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+    db_setup.add_node(TEST_SCHEMA, "filter-1", {"type": "dog", "age": 2, "tags": ["a"]})
+    db_setup.add_node(TEST_SCHEMA, "filter-2", {"type": "dog", "age": 12, "owner": None})
+    db_setup.add_node(TEST_SCHEMA, "filter-3", {"type": "human", "age": 27})
+
+    def get_ids(**kwargs):
+        rows = db_setup.get_nodes(TEST_SCHEMA, **kwargs)
+        return sorted(row[0] for row in rows)
+
+    assert get_ids(filters={"type": "dog"}) == ["filter-1", "filter-2"]
+    assert get_ids(filters={"type": "dog", "age": 2}) == ["filter-1"]
+    assert get_ids(filters={"tags": ["a"]}) == ["filter-1"]
+    assert get_ids(filters={"owner": None}) == ["filter-1", "filter-2", "filter-3"]
+    # filters are always combined with `AND`, whatever the operator
+    assert get_ids(node_id="filter-1", filters={"age": 2}) == ["filter-1"]
+    assert get_ids(node_id="filter-3", filters={"age": 2}) == []
+    assert get_ids(node_id="filter-3", operator="not", filters={"type": "dog"}) == []
+    assert get_ids(operator="not", filters={"type": "dog"}) == ["filter-1", "filter-2"]
+    assert get_ids(filters={"it's": 1}) == []
+
+    db_setup.add_node_index(TEST_SCHEMA, "type")
+    assert get_ids(filters={"type": "dog"}) == ["filter-1", "filter-2"]
+
+    sql_text = _render_params_sql(
+        db_setup._read_sql_file("select-nodes.sql", TEST_SCHEMA),
+        """(json_extract(body, '$."type"') IS ?)""",
+    )
+    query_plan = db_setup._connection.execute(f"EXPLAIN QUERY PLAN {sql_text}", ("dog",)).fetchall()
+    assert f"{TEST_SCHEMA}_nodes_type_idx" in str(query_plan)
+
+    with pytest.raises(ValueError):
+        db_setup.get_nodes(TEST_SCHEMA, filters={'"type"': "dog"})
+
+
+def test_database_get_nodes_predicates(db_setup):
+    """JSON path predicates compare body values in SQLite."""
+
+    db_setup.add_schema(TEST_SCHEMA)
+    db_setup.add_node(TEST_SCHEMA, "predicate-1", {"age": 2, "owner": {"name": "ed"}})
+    db_setup.add_node(TEST_SCHEMA, "predicate-2", {"age": 12, "owner": {"name": "spike"}})
+
+    def get_ids(*predicates, **kwargs):
+        rows = db_setup.get_nodes(TEST_SCHEMA, predicates=list(predicates), **kwargs)
+        return sorted(row[0] for row in rows)
+
+    assert get_ids(("$.age", ">", 2)) == ["predicate-2"]
+    assert get_ids(("$.age", ">=", 2), ("$.owner.name", "like", "e%")) == ["predicate-1"]
+    assert get_ids(("$.owner", "=", {"name": "ed"})) == ["predicate-1"]
+    assert get_ids(("$.missing", "is not", None)) == []
+    assert get_ids(("$.age", "<", 5), filters={"age": 12}) == []
+    assert get_ids(("$.age", ">", 5), node_id="predicate-1", operator="or") == []
+    assert get_ids(("$.age", ">", 5), node_id="predicate-2", operator="or") == ["predicate-2"]
+    assert get_ids(
+        ("$.age", ">", 5), node_id="predicate-2", node_body={"age": 12}, operator="not",
+    ) == []
+
+    # top-level paths use the key's index
+    db_setup.add_node_index(TEST_SCHEMA, "age")
+    sql_text = _render_params_sql(
+        db_setup._read_sql_file("select-nodes.sql", TEST_SCHEMA),
+        "(" + _json_path_sql("$.age") + " > ?)",
+    )
+    query_plan = db_setup._connection.execute(f"EXPLAIN QUERY PLAN {sql_text}", (2,)).fetchall()
+    assert f"{TEST_SCHEMA}_nodes_age_idx" in str(query_plan)
+
+    with pytest.raises(DisallowedOperatorError):
+        get_ids(("$.age", "; DROP TABLE test_nodes; --", 1))
+
+    # caller chosen paths don't grow the rendered SQL cache without bound
+    for i in range(CACHED_STATEMENTS + 10):
+        get_ids((f"$.k{i}", "=", 1))
+    assert _render_params_sql.cache_info().currsize <= CACHED_STATEMENTS
+
+
+def test_database_schema_scripts_join_transaction(db_setup):
+    """Schema changes are part of an open transaction."""
+
+    with pytest.raises(RuntimeError):
+        with db_setup.transaction():
+            db_setup.add_schema(TEST_SCHEMA)
+            db_setup.add_node(TEST_SCHEMA, "1", {})
+            raise RuntimeError
+
+    assert db_setup.get_schemas() == []
+
+    # semicolons inside trigger bodies are kept
+    statements = _split_sql_script(db_setup._read_sql_file("create-schema.sql", TEST_SCHEMA))
+    assert all(sqlite3.complete_statement(statement) for statement in statements)
+    assert sum("CREATE TRIGGER" in statement for statement in statements) == 3
+
+    # every schema renders its own scripts, the cache stays bounded
+    for i in range(CACHED_SCRIPTS):
+        db_setup.add_schema(f"split_{i}")
+        db_setup.delete_schema(f"split_{i}")
+    assert _split_sql_script.cache_info().currsize <= CACHED_SCRIPTS
+
+
+def test_database_query_cache(tmp_path):
+    """Cached results are reused until their schema is written to."""
+
+    db = Database(str(tmp_path / "cache.db"), query_cache_size=2)
+    db.add_schema(TEST_SCHEMA)
+    db.add_node(TEST_SCHEMA, "1", {"key": "value"})
+
+    node = db.get_node(TEST_SCHEMA, "1")
+    assert db.get_node(TEST_SCHEMA, "1") is node
+
+    db.update_node(TEST_SCHEMA, "1", {"key": "new-value"})
+    assert db.get_node(TEST_SCHEMA, "1")["body"] == '{"key":"new-value"}'
+
+    nodes = db.get_nodes(TEST_SCHEMA, node_id="1")
+    nodes.clear()
+    assert len(db.get_nodes(TEST_SCHEMA, node_id="1")) == 1
+
+    # rolled back writes aren't served from the cache
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.add_node(TEST_SCHEMA, "2", {})
+            assert db.get_node(TEST_SCHEMA, "2") is not None
+            raise RuntimeError
+    assert db.get_node(TEST_SCHEMA, "2") is None
+
+    assert len(db._query_cache) <= 2
+    db.close()
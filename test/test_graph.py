@@ -1,51 +1,48 @@
-import json
 import os
+import sys
 
 import pytest
 
 from conftest import TEST_DB, TEST_SCHEMA
+from src.ein import _json
+from src.ein._lazy import _LazyView
 from src.ein.edge import Edge
 from src.ein.graph import Graph
 from src.ein.node import Node
 
 
-def test_graph_init():
-    graph = Graph(TEST_DB)
+def test_graph_init(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    graph = Graph(db_path)
 
     assert isinstance(graph, Graph)
-    assert os.path.exists(TEST_DB)
+    assert os.path.exists(db_path)
 
 
-def test_graph_init_existing_db(graph_setup):
+def test_graph_init_existing_db(graph_setup, make_node):
     graph_setup.add_schema(TEST_SCHEMA)
-    node_one = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-edge-test",
-        body={"test": "value"},
-    )
-    node_two = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-edge-test2",
-        body={"test": "value"},
-    )
+    node_one = make_node("graph-add-edge-test")
+    node_two = make_node("graph-add-edge-test2")
     edge = Edge(
         schema_name=TEST_SCHEMA,
         source=node_one,
         target=node_two,
     )
 
-    graph_setup.add_node(schema_name=node_one.schema_name, node=node_one)
-    graph_setup.add_node(schema_name=node_two.schema_name, node=node_two)
-    graph_setup.add_edge(edge=edge)
+    with graph_setup.database.transaction():
+        graph_setup.add_node(schema_name=node_one.schema_name, node=node_one)
+        graph_setup.add_node(schema_name=node_two.schema_name, node=node_two)
+        graph_setup.add_edge(edge=edge)
 
     assert graph_setup.schemas == {TEST_SCHEMA}
     assert len(graph_setup.nodes) == 2
     assert len(graph_setup.edges) == 1
 
-    existing_db_graph = Graph(TEST_DB)
+    existing_db_graph = Graph(TEST_DB, uri=True)
     assert existing_db_graph.schemas == {TEST_SCHEMA}
     assert len(existing_db_graph.nodes) == 2
     assert len(existing_db_graph.edges) == 1
+    existing_db_graph.database.close()
 
 
 def test_graph_add_schema(db_setup, graph_setup):
@@ -70,50 +67,43 @@ def test_graph_add_schema(db_setup, graph_setup):
     WHERE
         type = 'index'
         AND
-        tbl_name LIKE '{TEST_SCHEMA}%';
+        tbl_name IN ('{TEST_SCHEMA}_nodes', '{TEST_SCHEMA}_edges');
     """
 
     schema_tables = db_setup.execute_sql(check_schema_tables_sql)
     schema_indexes = db_setup.execute_sql(check_schema_indexes_sql)
 
-    expected_schema_tables = [("test_nodes",), ("test_edges",)]
-    expected_indexes = [("sqlite_autoindex_test_nodes_1",), ("idx_id",), ("sqlite_autoindex_test_edges_1",), ("idx_source_target",)]
+    expected_schema_tables = [
+        ("test_nodes",), ("test_edges",),
+        # full-text index and its shadow tables
+        ("test_nodes_fts",), ("test_nodes_fts_data",), ("test_nodes_fts_idx",),
+        ("test_nodes_fts_docsize",), ("test_nodes_fts_config",),
+    ]
+    expected_indexes = [("sqlite_autoindex_test_nodes_1",), ("sqlite_autoindex_test_edges_1",), ("idx_test_source_target",)]
 
-    assert schema_tables == expected_schema_tables
-    assert schema_indexes == expected_indexes
+    assert set(schema_tables) == set(expected_schema_tables)
+    assert set(schema_indexes) == set(expected_indexes)
     assert graph_setup.schemas == {TEST_SCHEMA}
 
 
-def test_graph_add_node(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_add_node(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-node-test",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node.schema_name, node=node)
+    node = make_node("graph-add-node-test")
+    graph_setup.add_node(schema_name=node.schema_name, node=node)
 
     expected = db_setup_row_factory.get_node(schema_name=TEST_SCHEMA, node_id=node.id)
 
     assert node.id == expected["id"]
-    assert node.body == json.loads(expected["body"])
+    assert node.body == _json.loads(expected["body"])
 
 
-def test_graph_add_nodes(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_add_nodes(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node_one = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-nodes-test1",
-        body={"test": "value"},
-    )
-    node_two = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-nodes-test2",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_nodes(
+    node_one = make_node("graph-add-nodes-test1")
+    node_two = make_node("graph-add-nodes-test2")
+    graph_setup.add_nodes(
         schema_name=TEST_SCHEMA,
         nodes=[node_one, node_two]
     )
@@ -122,60 +112,40 @@ def test_graph_add_nodes(db_setup_row_factory, graph_setup_row_factory):
 
     assert len(expected) == 2
     assert node_one.id == expected[0]["id"]
-    assert node_one.body == json.loads(expected[0]["body"])
+    assert node_one.body == _json.loads(expected[0]["body"])
     assert node_two.id == expected[1]["id"]
-    assert node_two.body == json.loads(expected[1]["body"])
+    assert node_two.body == _json.loads(expected[1]["body"])
 
 
-def test_graph_add_edge(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_add_edge(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node_one = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-edge-test",
-        body={"test": "value"},
-    )
-    node_two = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-edge-test2",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node_one.schema_name, node=node_one)
-    graph_setup_row_factory.add_node(schema_name=node_two.schema_name, node=node_two)
+    node_one = make_node("graph-add-edge-test")
+    node_two = make_node("graph-add-edge-test2")
+    graph_setup.add_node(schema_name=node_one.schema_name, node=node_one)
+    graph_setup.add_node(schema_name=node_two.schema_name, node=node_two)
 
     edge = Edge(
         schema_name=TEST_SCHEMA,
         source=node_one,
         target=node_two,
     )
-    graph_setup_row_factory.add_edge(edge=edge)
+    graph_setup.add_edge(edge=edge)
 
     expected = db_setup_row_factory.get_edge(schema_name=TEST_SCHEMA, source_id=edge.source.id, target_id=edge.target.id)
     assert edge.source.id == expected["source"]
     assert edge.target.id == expected["target"]
 
 
-def test_graph_add_edge(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_add_edges(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node_one = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-edges-test",
-        body={"test": "value"},
-    )
-    node_two = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-edges-test2",
-        body={"test": "value"},
-    )
-    node_three = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-add-edges-test3",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node_one.schema_name, node=node_one)
-    graph_setup_row_factory.add_node(schema_name=node_two.schema_name, node=node_two)
-    graph_setup_row_factory.add_node(schema_name=node_three.schema_name, node=node_three)
+    node_one = make_node("graph-add-edges-test")
+    node_two = make_node("graph-add-edges-test2")
+    node_three = make_node("graph-add-edges-test3")
+    graph_setup.add_node(schema_name=node_one.schema_name, node=node_one)
+    graph_setup.add_node(schema_name=node_two.schema_name, node=node_two)
+    graph_setup.add_node(schema_name=node_three.schema_name, node=node_three)
 
     edge_one = Edge(
         schema_name=TEST_SCHEMA,
@@ -187,7 +157,7 @@ def test_graph_add_edge(db_setup_row_factory, graph_setup_row_factory):
         source=node_two,
         target=node_three,
     )
-    graph_setup_row_factory.add_edges(schema_name=TEST_SCHEMA, edges=[edge_one, edge_two])
+    graph_setup.add_edges(schema_name=TEST_SCHEMA, edges=[edge_one, edge_two])
 
     expected = db_setup_row_factory.get_all_edges(schema_name=TEST_SCHEMA)
     assert edge_one.source.id == expected[0]["source"]
@@ -196,32 +166,24 @@ def test_graph_add_edge(db_setup_row_factory, graph_setup_row_factory):
     assert edge_two.target.id == expected[1]["target"]
 
 
-def test_graph_add_multi_schema_edge(db_setup_row_factory, graph_setup_row_factory):
+def test_graph_add_multi_schema_edge(db_setup_row_factory, graph_setup, make_node):
     schema_one = "test1"
     schema_two = "test2"
 
-    graph_setup_row_factory.add_schema(schema_one)
-    graph_setup_row_factory.add_schema(schema_two)
+    graph_setup.add_schema(schema_one)
+    graph_setup.add_schema(schema_two)
 
-    node_one = Node(
-        schema_name=schema_one,
-        id="graph-add-multi-schema-edge-test",
-        body={"test": "value"},
-    )
-    node_two = Node(
-        schema_name=schema_two,
-        id="graph-add-multi-schema-edge-test2",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node_one.schema_name, node=node_one)
-    graph_setup_row_factory.add_node(schema_name=node_two.schema_name, node=node_two)
+    node_one = make_node("graph-add-multi-schema-edge-test", schema_one)
+    node_two = make_node("graph-add-multi-schema-edge-test2", schema_two)
+    graph_setup.add_node(schema_name=node_one.schema_name, node=node_one)
+    graph_setup.add_node(schema_name=node_two.schema_name, node=node_two)
 
     edge = Edge(
         schema_name=schema_one,
         source=node_one,
         target=node_two,
     )
-    graph_setup_row_factory.add_edge(edge=edge)
+    graph_setup.add_edge(edge=edge)
 
     expected = db_setup_row_factory.get_edge(
         schema_name=schema_one,
@@ -237,54 +199,42 @@ def test_graph_add_multi_schema_edge(db_setup_row_factory, graph_setup_row_facto
     assert edge.target.schema_name == expected["target_schema"]
 
 
-def test_graph_update_node(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_update_node(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-update-node-test",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node.schema_name, node=node)
+    node = make_node("graph-update-node-test")
+    graph_setup.add_node(schema_name=node.schema_name, node=node)
 
     node.body = {"test-something": "value"}
-    graph_setup_row_factory.update_node(node=node)
+    graph_setup.update_node(node=node)
 
     expected = db_setup_row_factory.get_node(schema_name=node.schema_name, node_id=node.id)
     assert node.id == expected["id"]
-    assert node.body == json.loads(expected["body"])
+    assert node.body == _json.loads(expected["body"])
 
 
-def test_graph_update_edge(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_update_edge(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node_one = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-update-edge-test",
-        body={"test": "value"},
-    )
-    node_two = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-update-edge-test2",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node_one.schema_name, node=node_one)
-    graph_setup_row_factory.add_node(schema_name=node_two.schema_name, node=node_two)
+    node_one = make_node("graph-update-edge-test")
+    node_two = make_node("graph-update-edge-test2")
+    graph_setup.add_node(schema_name=node_one.schema_name, node=node_one)
+    graph_setup.add_node(schema_name=node_two.schema_name, node=node_two)
 
     edge = Edge(
         schema_name=TEST_SCHEMA,
         source=node_one,
         target=node_two,
     )
-    graph_setup_row_factory.add_edge(edge=edge)
+    graph_setup.add_edge(edge=edge)
 
     edge.properties = {"test-property": "some-property"}
-    graph_setup_row_factory.update_edge(edge=edge)
+    graph_setup.update_edge(edge=edge)
 
     expected = db_setup_row_factory.get_edge(schema_name=TEST_SCHEMA, source_id=edge.source.id, target_id=edge.target.id)
     assert edge.source.id == expected["source"]
     assert edge.target.id == expected["target"]
-    assert edge.properties == json.loads(expected["properties"])
+    assert edge.properties == _json.loads(expected["properties"])
 
 
 def test_graph_delete_schema(db_setup, graph_setup):
@@ -310,46 +260,237 @@ def test_graph_delete_schema(db_setup, graph_setup):
     assert len(graph_setup.schemas) == 0
 
 
-def test_graph_delete_node(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_delete_node(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-delete-node-test",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node.schema_name, node=node)
-    graph_setup_row_factory.delete_node(node=node)
-    assert graph_setup_row_factory.nodes == {}
+    node = make_node("graph-delete-node-test")
+    graph_setup.add_node(schema_name=node.schema_name, node=node)
+    graph_setup.delete_node(node=node)
+    assert graph_setup.nodes == {}
 
     expected = db_setup_row_factory.get_node(schema_name=node.schema_name, node_id=node.id)
     assert expected is None
 
 
-def test_graph_delete_edge(db_setup_row_factory, graph_setup_row_factory):
-    graph_setup_row_factory.add_schema(TEST_SCHEMA)
+def test_graph_delete_edge(db_setup_row_factory, graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
 
-    node_one = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-delete-edge-test",
-        body={"test": "value"},
-    )
-    node_two = Node(
-        schema_name=TEST_SCHEMA,
-        id="graph-delete-edge-test2",
-        body={"test": "value"},
-    )
-    graph_setup_row_factory.add_node(schema_name=node_one.schema_name, node=node_one)
-    graph_setup_row_factory.add_node(schema_name=node_two.schema_name, node=node_two)
+    node_one = make_node("graph-delete-edge-test")
+    node_two = make_node("graph-delete-edge-test2")
+    graph_setup.add_node(schema_name=node_one.schema_name, node=node_one)
+    graph_setup.add_node(schema_name=node_two.schema_name, node=node_two)
 
     edge = Edge(
         schema_name=TEST_SCHEMA,
         source=node_one,
         target=node_two,
     )
-    graph_setup_row_factory.add_edge(edge=edge)
-    assert len(graph_setup_row_factory.edges) == 1
+    graph_setup.add_edge(edge=edge)
+    assert len(graph_setup.edges) == 1
+
+    graph_setup.delete_edge(edge=edge)
+    assert len(graph_setup.edges) == 0
+
+
+def test_graph_get_edge_lookup(graph_setup):
+    """Edges are keyed by source and target IDs."""
+
+    graph_setup.add_schema(TEST_SCHEMA)
+    node_one = Node(schema_name=TEST_SCHEMA, id="edge-lookup-1", body={})
+    node_two = Node(schema_name=TEST_SCHEMA, id="edge-lookup-2", body={})
+    graph_setup.add_node(TEST_SCHEMA, node_one)
+    graph_setup.add_node(TEST_SCHEMA, node_two)
+
+    edge = Edge(schema_name=TEST_SCHEMA, source=node_one, target=node_two)
+    graph_setup.add_edge(edge)
+
+    assert graph_setup.get_edge(node_one, node_two) == edge
+    assert graph_setup.get_edge(node_two, node_one) is None
+    assert list(graph_setup.edges) == [("edge-lookup-1", "edge-lookup-2")]
+    assert edge != Edge(schema_name=TEST_SCHEMA, source=node_two, target=node_one)
+
+    edge.properties = {"weight": 2}
+    graph_setup.update_edge(edge)
+    assert graph_setup.get_edge(node_one, node_two).properties == {"weight": 2}
+    assert len(graph_setup.edges) == 1
+
+    graph_setup.delete_edge(edge)
+    assert graph_setup.get_edge(node_one, node_two) is None
+
+
+def test_graph_build_csr(graph_setup):
+    """Successors are slices of the CSR arrays."""
+
+    graph_setup.add_schema(TEST_SCHEMA)
+    nodes = [Node(schema_name=TEST_SCHEMA, id=f"csr-{i}", body={}) for i in range(3)]
+    graph_setup.add_nodes(TEST_SCHEMA, nodes)
+    graph_setup.add_edges(TEST_SCHEMA, [
+        Edge(schema_name=TEST_SCHEMA, source=nodes[0], target=nodes[1]),
+        Edge(schema_name=TEST_SCHEMA, source=nodes[2], target=nodes[0]),
+        Edge(schema_name=TEST_SCHEMA, source=nodes[0], target=nodes[2]),
+    ])
+
+    node_ids, indptr, indices = graph_setup.build_csr()
+
+    def successors(node_id):
+        index = node_ids.index(node_id)
+        return sorted(node_ids[i] for i in indices[indptr[index]:indptr[index + 1]])
+
+    assert successors("csr-0") == ["csr-1", "csr-2"]
+    assert successors("csr-1") == []
+    assert successors("csr-2") == ["csr-0"]
+    assert list(indptr) == [0, 2, 2, 3]
+
+
+def test_graph_get_node_missing(graph_setup):
+    """Missing nodes return `None`."""
+
+    assert graph_setup.get_node("not-a-node") is None
+
+
+def test_graph_lazy(tmp_path):
+    """Lazy graphs load nodes and edges on access."""
+
+    db_path = str(tmp_path / "lazy.db")
+    graph = Graph(db_path)
+    graph.add_schema(TEST_SCHEMA)
+    nodes = [Node(schema_name=TEST_SCHEMA, id=f"lazy-{i}", body={"i": i}) for i in range(3)]
+    graph.add_nodes(TEST_SCHEMA, nodes)
+    graph.add_edge(Edge(schema_name=TEST_SCHEMA, source=nodes[0], target=nodes[1]))
+    graph.database.close()
+
+    lazy_graph = Graph(db_path, lazy=True, cache_size=2)
+    assert len(lazy_graph.nodes._cache) == 0
+    assert len(lazy_graph.nodes) == 3
+    assert len(lazy_graph.edges) == 1
+    assert sorted(lazy_graph.nodes) == ["lazy-0", "lazy-1", "lazy-2"]
+
+    assert lazy_graph.get_node("lazy-2").body == {"i": 2}
+    assert lazy_graph.get_node("missing") is None
+    edge = lazy_graph.get_edge(nodes[0], nodes[1])
+    assert edge.source.body == {"i": 0}
+    assert edge.target.id == "lazy-1"
+    # least recently used objects are dropped
+    assert len(lazy_graph.nodes._cache) == 2
+
+    lazy_graph.delete_node(lazy_graph.get_node("lazy-2"))
+    assert lazy_graph.get_node("lazy-2") is None
+    assert lazy_graph.build_csr()[0] == ["lazy-0", "lazy-1"]
+
+    with pytest.raises(KeyError):
+        del lazy_graph.nodes["missing"]
+
+    # deleting an uncached key deletes it from the db
+    lazy_graph.nodes.invalidate()
+    lazy_graph.edges.invalidate()
+    del lazy_graph.edges[("lazy-0", "lazy-1")]
+    del lazy_graph.nodes["lazy-1"]
+    assert "lazy-1" not in lazy_graph.nodes
+    assert ("lazy-0", "lazy-1") not in lazy_graph.edges
+    assert lazy_graph.database.get_node(TEST_SCHEMA, "lazy-1") is None
+    assert len(lazy_graph.edges) == 0
+    with pytest.raises(TypeError):
+        _LazyView(lazy_graph)
+    lazy_graph.database.close()
+
+
+def test_graph_node_body_decoded_on_access(graph_setup):
+    """Bodies read from the db are parsed when first used."""
+
+    graph_setup.add_schema(TEST_SCHEMA)
+    graph_setup.add_node(TEST_SCHEMA, Node(schema_name=TEST_SCHEMA, id="raw", body={"key": 1}), refresh=True)
+
+    node = graph_setup.get_node("raw")
+    assert node._raw_body == '{"key":1}'
+    assert node.body == {"key": 1}
+    assert node._raw_body is None
+
+    node.body = {"key": 2}
+    assert node.body == {"key": 2}
+
+    # IDs from the db share one string object
+    assert node.id is sys.intern("".join(["r", "aw"]))
+    assert node.schema_name is sys.intern("".join(list(TEST_SCHEMA)))
 
-    graph_setup_row_factory.delete_edge(edge=edge)
-    assert len(graph_setup_row_factory.edges) == 0
 
+def test_graph_add_node_refresh(graph_setup, make_node):
+    graph_setup.add_schema(TEST_SCHEMA)
+
+    node = make_node("graph-refresh-test")
+    graph_setup.add_node(schema_name=TEST_SCHEMA, node=node)
+    assert graph_setup.get_node(node.id) is node
+
+    graph_setup.add_node(schema_name=TEST_SCHEMA, node=make_node("graph-refresh-test2"), refresh=True)
+    refreshed = graph_setup.get_node("graph-refresh-test2")
+    assert refreshed.body == {"test": "value"}
+
+
+def test_graph_readers(tmp_path):
+    graph = Graph(str(tmp_path / "readers.db"), readers=2)
+    graph.add_schema(TEST_SCHEMA)
+    graph.add_node(TEST_SCHEMA, Node(schema_name=TEST_SCHEMA, id="1", body={}))
+
+    assert len(graph.database._reader_cursors) == 2
+    assert graph.database.get_node(TEST_SCHEMA, "1")["id"] == "1"
+
+    graph.database.close()
+
+
+def test_graph_schema_name_with_underscore(tmp_path):
+    db_path = str(tmp_path / "underscore.db")
+    graph = Graph(db_path)
+    graph.add_schema("my_graph")
+    graph.add_node("my_graph", Node(schema_name="my_graph", id="1", body={}))
+    graph.database.close()
+
+    graph = Graph(db_path)
+    assert graph.schemas == {"my_graph"}
+    assert graph.get_node("1").schema_name == "my_graph"
+    graph.database.close()
+
+
+def test_graph_add_bulk(db_setup_row_factory, graph_setup):
+    graph_setup.add_schema(TEST_SCHEMA)
+
+    nodes = [
+        Node(schema_name=TEST_SCHEMA, id=f"graph-add-bulk-test{i}", body={"test": i})
+        for i in range(3)
+    ]
+    edges = [
+        Edge(schema_name=TEST_SCHEMA, source=nodes[0], target=nodes[1]),
+        Edge(schema_name=TEST_SCHEMA, source=nodes[1], target=nodes[2]),
+    ]
+    graph_setup.add_bulk(schema_name=TEST_SCHEMA, nodes=nodes, edges=edges)
+
+    assert db_setup_row_factory.count_nodes(TEST_SCHEMA) == 3
+    assert db_setup_row_factory.count_edges(TEST_SCHEMA) == 2
+    assert graph_setup.get_node(nodes[2].id) is nodes[2]
+    assert graph_setup.get_edge(nodes[0], nodes[1]) is edges[0]
+
+
+def test_graph_node_edge_equality():
+    node_one = Node(schema_name=TEST_SCHEMA, id="eq-1", body={})
+    node_two = Node(schema_name=TEST_SCHEMA, id="eq-2", body={})
+
+    assert node_one == Node(schema_name=TEST_SCHEMA, id="eq-1", body={"other": 1})
+    assert node_one != node_two
+    assert len({node_one, node_two, Node(schema_name=TEST_SCHEMA, id="eq-2")}) == 2
+
+    edge = Edge(schema_name=TEST_SCHEMA, source=node_one, target=node_two)
+    assert edge == Edge(schema_name=TEST_SCHEMA, source=node_one, target=node_two)
+    assert edge != Edge(schema_name=TEST_SCHEMA, source=node_two, target=node_one)
+    assert {edge: 1}[Edge(schema_name=TEST_SCHEMA, source=node_one, target=node_two)] == 1
+
+
+def test_graph_reload(db_setup, graph_setup):
+    graph_setup.add_schema(TEST_SCHEMA)
+
+    # written behind the graph's back
+    db_setup.add_nodes(TEST_SCHEMA, [("reload-1", "{}"), ("reload-2", "{}")])
+    db_setup.add_edge(TEST_SCHEMA, "reload-1", "reload-2")
+    assert len(graph_setup.nodes) == 0
+
+    graph_setup.reload()
+    assert graph_setup.schemas == {TEST_SCHEMA}
+    assert len(graph_setup.nodes) == 2
+    assert graph_setup.get_edge(graph_setup.get_node("reload-1"), graph_setup.get_node("reload-2"))